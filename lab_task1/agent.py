@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Agent:
     def __init__(self, environment):
         self.environment = environment
@@ -20,3 +23,33 @@ class Agent:
 
     def status(self):        
         return self.position  
+
+
+class AgentSwarm:
+    """Many agents moving on one Environment, as NumPy arrays.
+
+    positions is an (n, 2) integer array and speeds an (n,) integer array;
+    move() advances every agent exactly like Agent.move() would, in one
+    vectorized step.
+    """
+
+    DIRECTIONS = ("up", "down", "left", "right")  # Direction codes 0-3 for move()
+    STEPS = np.array([[0, -1], [0, 1], [-1, 0], [1, 0]])
+
+    def __init__(self, environment, count, position=(140, 200), speed=10):
+        self.environment = environment
+        self.positions = np.tile(np.array(position, dtype=np.int64), (count, 1))
+        self.speeds = np.full(count, speed, dtype=np.int64)
+        self.size = [30, 30]
+
+    def __len__(self):
+        return len(self.speeds)
+
+    def move(self, directions):
+        """Move every agent one step; directions holds a code per agent (an index into DIRECTIONS)."""
+        self.positions += self.STEPS[directions] * self.speeds[:, None]
+        self.speeds += 5
+        self.environment.limit_positions(self.positions)
+
+    def status(self):
+        return self.positions
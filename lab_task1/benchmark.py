@@ -0,0 +1,59 @@
+import argparse
+import time
+
+import numpy as np
+
+from agent import Agent, AgentSwarm
+from environment import Environment
+
+
+def random_directions(count, steps, seed):
+    """A (steps, count) array of direction codes, one per agent and step."""
+    return np.random.default_rng(seed).integers(len(AgentSwarm.DIRECTIONS), size=(steps, count))
+
+
+def run_scalar(environment, directions):
+    agents = [Agent(environment) for _ in range(directions.shape[1])]
+    names = [[AgentSwarm.DIRECTIONS[code] for code in row] for row in directions.tolist()]
+    start = time.perf_counter()
+    for row in names:
+        for agent, direction in zip(agents, row):
+            agent.move(direction)
+    return time.perf_counter() - start, np.array([agent.status() for agent in agents])
+
+
+def run_swarm(environment, directions):
+    swarm = AgentSwarm(environment, directions.shape[1])
+    start = time.perf_counter()
+    for row in directions:
+        swarm.move(row)
+    return time.perf_counter() - start, swarm.status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Agent and AgentSwarm throughput in agent-steps/sec.")
+    parser.add_argument("--counts", nargs="+", type=int, default=[10, 1000, 100000])
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--scalar-limit", type=int, default=10000,
+                        help="largest agent count also run with the scalar Agent")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    environment = Environment(width=800, height=600)
+    print(f"{'agents':>8} {'scalar steps/s':>16} {'swarm steps/s':>16} {'speedup':>8}  match")
+    for count in args.counts:
+        directions = random_directions(count, args.steps, args.seed)
+        agent_steps = count * args.steps
+        swarm_time, swarm_positions = run_swarm(environment, directions)
+        swarm_rate = agent_steps / swarm_time
+        if count <= args.scalar_limit:
+            scalar_time, scalar_positions = run_scalar(environment, directions)
+            scalar_rate = agent_steps / scalar_time
+            match = "yes" if np.array_equal(scalar_positions, swarm_positions) else "NO"
+            print(f"{count:>8} {scalar_rate:>16,.0f} {swarm_rate:>16,.0f} {swarm_rate / scalar_rate:>7.1f}x  {match}")
+        else:
+            print(f"{count:>8} {'-':>16} {swarm_rate:>16,.0f} {'-':>8}  -")
+
+
+if __name__ == "__main__":
+    main()
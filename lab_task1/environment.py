@@ -15,3 +15,17 @@ class Environment:
             position[1] = 0
 
         return position 
+
+    def limit_positions(self, positions):
+        """limit_position() for an (n, 2) array of positions, in place.
+
+        A position past an edge jumps to the opposite edge rather than
+        wrapping by the overshoot, so this masks instead of using modulo.
+        """
+        for axis, limit in enumerate((self.width, self.height)):
+            values = positions[:, axis]
+            below = values < 0
+            above = values >= limit
+            values[below] = limit - 1
+            values[above] = 0
+        return positions
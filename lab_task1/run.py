@@ -1,25 +1,25 @@
+import argparse
 import pygame
 from agent import Agent
 from environment import Environment
+from loop import FixedStepLoop
 
 def main():
+    parser = argparse.ArgumentParser(description="Move an agent around with the arrow keys.")
+    parser.add_argument("--tick-rate", type=float, default=15, help="agent updates per second")
+    parser.add_argument("--fps", type=float, default=60, help="frames per second of the view")
+    parser.add_argument("--max-speed", action="store_true", help="update the agent as fast as possible")
+    args = parser.parse_args()
+
     pygame.init()
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("Agent Environment Simulation")
 
     env = Environment(width=800, height=600)
     agent = Agent(environment=env)
+    font = pygame.font.Font(None, 36)
 
-    running = True
-    clock = pygame.time.Clock()
-
-    while running:
-        screen.fill((255, 255, 255))
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        
+    def update():
         keys = pygame.key.get_pressed()
         if keys[pygame.K_UP]:
             agent.move("up")
@@ -30,20 +30,26 @@ def main():
         elif keys[pygame.K_RIGHT]:
             agent.move("right")
 
+    def render():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+
+        screen.fill((255, 255, 255))
+
         position = agent.status()
         rect_position = (position[0], position[1], agent.size[0], agent.size[1])
 
         pygame.draw.rect(screen, (0, 0, 255), rect_position)
 
-        font = pygame.font.Font(None, 36)
         text = font.render(f"Position: {position}", True, (0, 0, 0))
         text2 = font.render(f"Position: {position}", True, (0, 0, 0))
         screen.blit(text, (10, 10))
         screen.blit(text2, (300, 260))
 
-
         pygame.display.flip()
-        clock.tick(15)
+
+    FixedStepLoop(update, args.tick_rate, render=render, frame_rate=args.fps, max_speed=args.max_speed).run()
 
     pygame.quit()
 
@@ -0,0 +1,138 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+from environment import Environment
+from search import SEARCHES
+
+FIELDS = ['algorithm', 'columns', 'rows', 'barrier_density', 'num_tasks', 'seed',
+          'searches', 'tasks_completed', 'path_cost', 'nodes_expanded', 'pushed', 'stale_pops',
+          'visited', 'peak_frontier', 'wall_time', 'time_per_search']
+
+
+def make_environment(size, barrier_density, num_tasks, seed):
+    """Build a reproducible size x size grid (one pixel per cell)."""
+    num_barriers = int(barrier_density * size * size)
+    environment = Environment(size, size, 1, num_tasks=num_tasks, num_barriers=num_barriers, seed=seed)
+    environment.neighbors  # Build the lazy neighbor and jump tables before any search is timed
+    environment.jump_tables
+    return environment
+
+
+def run_case(algorithm, environment):
+    """Walk one agent from (0, 0) through every reachable task without any display."""
+    search = SEARCHES[algorithm]
+    initial_tasks = environment.task_locations.copy()
+    position = (0, 0)
+    result = {'searches': 0, 'tasks_completed': 0, 'path_cost': 0, 'nodes_expanded': 0,
+              'pushed': 0, 'stale_pops': 0, 'visited': 0, 'peak_frontier': 0, 'wall_time': 0.0}
+
+    while environment.task_locations:
+        if position in environment.task_locations:
+            environment.task_locations.pop(position)
+            result['tasks_completed'] += 1
+            continue
+
+        start = time.perf_counter()
+        path, stats = search(environment, position, list(environment.task_locations))
+        result['wall_time'] += time.perf_counter() - start
+        result['searches'] += 1
+        result['nodes_expanded'] += stats['expanded']
+        result['pushed'] += stats['pushed']
+        result['stale_pops'] += stats['stale_pops']
+        result['visited'] += stats['visited']
+        result['peak_frontier'] = max(result['peak_frontier'], stats['peak_frontier'])
+        if not path:
+            break  # Remaining tasks are unreachable
+        result['path_cost'] += len(path)
+        # Like the agent in run.py, complete every task the path passes over
+        for location in path:
+            if location in environment.task_locations:
+                environment.task_locations.pop(location)
+                result['tasks_completed'] += 1
+        position = path[-1]
+
+    environment.task_locations = initial_tasks
+    result['time_per_search'] = result['wall_time'] / max(result['searches'], 1)
+    return result
+
+
+def run_benchmark(algorithms, sizes, densities, task_counts, seeds):
+    rows = []
+    for size in sizes:
+        for density in densities:
+            for num_tasks in task_counts:
+                for seed in range(seeds):
+                    environment = make_environment(size, density, num_tasks, seed)
+                    for algorithm in algorithms:
+                        row = {'algorithm': algorithm, 'columns': size, 'rows': size,
+                               'barrier_density': density, 'num_tasks': num_tasks, 'seed': seed}
+                        row.update(run_case(algorithm, environment))
+                        rows.append(row)
+    return rows
+
+
+def case_key(row):
+    return (row['algorithm'], row['columns'], row['rows'], row['barrier_density'],
+            row['num_tasks'], row['seed'])
+
+
+def find_regressions(rows, baseline_rows, tolerance):
+    """Compare rows against a baseline run; wall time and nodes may grow by `tolerance`x."""
+    baseline = {case_key(row): row for row in baseline_rows}
+    regressions = []
+    for row in rows:
+        old = baseline.get(case_key(row))
+        if old is None:
+            continue
+        if row['path_cost'] > old['path_cost']:
+            regressions.append((row, 'path_cost', old['path_cost']))
+        if row['nodes_expanded'] > old['nodes_expanded'] * tolerance:
+            regressions.append((row, 'nodes_expanded', old['nodes_expanded']))
+        if row['wall_time'] > old['wall_time'] * tolerance:
+            regressions.append((row, 'wall_time', old['wall_time']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the grid search strategies headlessly.")
+    parser.add_argument("--algorithms", nargs="+", default=list(SEARCHES), choices=list(SEARCHES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[20, 50, 100])
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.0, 0.1, 0.25])
+    parser.add_argument("--tasks", nargs="+", type=int, default=[5, 20])
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeded grids per setting")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="allowed growth factor of wall time and nodes expanded over the baseline")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.algorithms, args.sizes, args.densities, args.tasks, args.seeds)
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    if args.format == "json":
+        json.dump(rows, output, indent=2)
+        output.write("\n")
+    else:
+        writer = csv.DictWriter(output, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    if args.output:
+        output.close()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(rows, json.load(f), args.tolerance)
+        for row, metric, old in regressions:
+            print(f"REGRESSION {row['algorithm']} {row['columns']}x{row['rows']} "
+                  f"density={row['barrier_density']} tasks={row['num_tasks']} seed={row['seed']}: "
+                  f"{metric} {row[metric]} vs baseline {old}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
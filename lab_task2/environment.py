@@ -1,34 +1,199 @@
-import random
+import itertools
+import weakref
+
+import numpy as np
+
+
+def location_array(locations):
+    """(n, 2) integer array of an iterable of (x, y) locations."""
+    locations = list(locations)
+    flat = np.fromiter(itertools.chain.from_iterable(locations), dtype=np.int64, count=2 * len(locations))
+    return flat.reshape(-1, 2)
+
 
 class Environment:
-    def __init__(self, width, height, grid_size, num_tasks, num_barriers):
+    def __init__(self, width, height, grid_size, num_tasks, num_barriers, seed=None):
         self.width = width
         self.height = height
         self.grid_size = grid_size
         self.columns = width // grid_size
         self.rows = height // grid_size
+        # Cell ids index a grid padded by one blocked cell on every side, so
+        # neighbor lookups never need a bounds check. Ids are column-major,
+        # which makes comparing two ids the same as comparing their (x, y).
+        self.padded_rows = self.rows + 2
+        self.neighbor_offsets = (1, self.padded_rows, -1, -self.padded_rows)  # Same order as (0, 1), (1, 0), (0, -1), (-1, 0)
+        self.rng = np.random.default_rng(seed)  # Same seed, same tasks and barriers
+        self.barrier_listeners = weakref.WeakSet()  # Told about update_barriers() changes
+        self.planners = {}  # Planners search strategies keep between calls, by strategy name
         self.task_locations = self.generate_tasks(num_tasks)
         self.barrier_locations = self.generate_random_locations(num_barriers, exclude=set(self.task_locations.keys()))
 
+    @property
+    def barrier_locations(self):
+        return self._barrier_locations
+
+    @barrier_locations.setter
+    def barrier_locations(self, locations):
+        self._barrier_locations = locations
+        self.build_grid()
+
+    def build_grid(self):
+        """Rebuild the occupancy grid from barrier_locations; the neighbor table follows on first use."""
+        grid = np.ones((self.columns + 2, self.padded_rows), dtype=np.uint8)  # 1 = blocked, the border stays blocked
+        grid[1:-1, 1:-1] = 0
+        if self._barrier_locations:
+            x, y = location_array(self._barrier_locations).T
+            grid[x + 1, y + 1] = 1
+        self.occupancy = bytearray(grid.tobytes())
+        self._neighbors = None
+        self._jump_tables = None
+
+    def update_barriers(self, added=(), removed=()):
+        """Add and remove barriers in place and tell the barrier listeners.
+
+        occupancy and only the neighbor table entries around the changed
+        cells are updated in place. Every object in barrier_listeners then
+        gets barriers_changed(locations) with the locations that actually
+        changed, so it can repair just those; occupancy is only replaced by
+        assigning barrier_locations, which is how caches of it tell a new
+        grid apart. Returns the changed locations.
+        """
+        barriers = self._barrier_locations
+        added = {location for location in added
+                 if self.is_within_bounds(*location) and location not in barriers}
+        removed = {location for location in removed if location in barriers} - added
+        changed = added | removed
+        if not changed:
+            return changed
+
+        barriers |= added
+        barriers -= removed
+        occupancy = self.occupancy
+        for location in changed:
+            occupancy[self.cell_id(*location)] = location in added
+
+        if self._neighbors is not None:
+            neighbors = self._neighbors
+            offsets = self.neighbor_offsets
+            cells = {self.cell_id(*location) for location in changed}
+            cells.update([cell + offset for cell in cells for offset in offsets])
+            for cell in cells:
+                if self.is_within_bounds(*self.cell_location(cell)):  # The padding keeps no neighbors
+                    neighbors[cell] = tuple(cell + offset for offset in offsets if not occupancy[cell + offset])
+
+        self._jump_tables = None  # A barrier changes the runs of its whole row and column
+
+        for listener in list(self.barrier_listeners):
+            listener.barriers_changed(changed)
+        return changed
+
+    @property
+    def neighbors(self):
+        if self._neighbors is None:
+            self._neighbors = self.build_neighbors()
+        return self._neighbors
+
+    def build_neighbors(self):
+        """Free neighbors of every in-bounds cell (barrier cells included, so a
+        search can still leave one it starts on)."""
+        occupancy = self.occupancy
+        offsets = self.neighbor_offsets
+        size = len(occupancy)
+        neighbors = [()] * size
+        for x in range(self.columns):
+            for y in range(self.rows):
+                cell = self.cell_id(x, y)
+                neighbors[cell] = tuple(cell + offset for offset in offsets
+                                        if not occupancy[cell + offset])
+        return neighbors
+
+    @property
+    def jump_tables(self):
+        if self._jump_tables is None:
+            self._jump_tables = self.build_jump_tables()
+        return self._jump_tables
+
+    def build_jump_tables(self):
+        """Where a straight walk from each cell stops, for Jump Point Search.
+
+        Maps each step in neighbor_offsets to a list giving, for every cell
+        id, the first cell at or after it in that direction that is blocked
+        or has a forced neighbor. Vertical walks also stop next to any cell
+        from which a horizontal walk would stop on a free cell, so a jump
+        never has to look sideways. The goal is left to the search.
+        """
+        rows = self.padded_rows
+        blocked = np.frombuffer(bytes(self.occupancy), dtype=np.uint8).reshape(-1, rows).astype(bool)
+        free = ~blocked
+        ids = np.arange(blocked.size).reshape(blocked.shape)
+        tables = {}
+
+        def first_stop(stops, axis, forward):
+            """The id of the first stop at or after each cell along axis."""
+            if forward:
+                stop_ids = np.where(stops, ids, blocked.size)
+                return np.flip(np.minimum.accumulate(np.flip(stop_ids, axis), axis=axis), axis)
+            return np.maximum.accumulate(np.where(stops, ids, -1), axis=axis)
+
+        # Horizontal: a cell above or below opens up that was blocked one step back
+        for step, back in ((rows, slice(None, -2)), (-rows, slice(2, None))):
+            forced = np.zeros_like(blocked)
+            forced[1:-1, 1:-1] = ((free[1:-1, :-2] & blocked[back, :-2])
+                                  | (free[1:-1, 2:] & blocked[back, 2:]))
+            tables[step] = first_stop(blocked | forced, 0, step > 0)
+
+        # A horizontal walk from a cell's left or right neighbor finds a jump point
+        turn = np.zeros_like(blocked)
+        flat_free = free.ravel()
+        turn[1:-1, 1:-1] = (flat_free[tables[rows][2:, 1:-1]] | flat_free[tables[-rows][:-2, 1:-1]])
+
+        for step, back in ((1, slice(None, -2)), (-1, slice(2, None))):
+            forced = np.zeros_like(blocked)
+            forced[1:-1, 1:-1] = ((free[:-2, 1:-1] & blocked[:-2, back])
+                                  | (free[2:, 1:-1] & blocked[2:, back]))
+            tables[step] = first_stop(blocked | forced | turn, 1, step > 0)
+        return {step: table.ravel().tolist() for step, table in tables.items()}
+
+    def cell_id(self, x, y):
+        """Integer id of (x, y) in the padded grid."""
+        return (x + 1) * self.padded_rows + y + 1
+
+    def cell_location(self, cell):
+        """(x, y) of a cell id."""
+        x, y = divmod(cell, self.padded_rows)
+        return (x - 1, y - 1)
+
+    def sample_locations(self, count, exclude=()):
+        """`count` distinct random (x, y) locations outside `exclude`, in random order.
+
+        Samples without replacement from the indices of the free cells, so
+        nothing is ever redrawn however full the grid gets. Raises
+        ValueError if fewer than `count` cells are free.
+        """
+        # Column-major cell indices, like cell ids without the padding
+        x, y = location_array(exclude).T
+        inside = (x >= 0) & (x < self.columns) & (y >= 0) & (y < self.rows)
+        excluded = np.unique(x[inside] * self.rows + y[inside])
+        free = self.columns * self.rows - len(excluded)
+        if not 0 <= count <= free:
+            raise ValueError(f"cannot place {count} locations on a grid with {free} free cells")
+        indices = self.rng.choice(free, size=count, replace=False)
+        if excluded.size:
+            # The i-th free cell is i plus the number of excluded cells at or below it;
+            # excluded[j] - j is how many free cells come before the j-th excluded one
+            indices = indices + np.searchsorted(excluded - np.arange(excluded.size), indices, side='right')
+        x, y = np.divmod(indices, self.rows)
+        return list(zip(x.tolist(), y.tolist()))
+
     def generate_tasks(self, count):
         """Generate task locations with unique task numbers."""
-        tasks = {}
-        for task_number in range(1, count + 1):
-            while True:
-                location = (random.randint(0, self.columns - 1), random.randint(0, self.rows - 1))
-                if location not in tasks:
-                    tasks[location] = task_number
-                    break
-        return tasks
+        return {location: task_number
+                for task_number, location in enumerate(self.sample_locations(count), start=1)}
 
     def generate_random_locations(self, count, exclude=set()):
         """Generate unique random locations that are not in the exclude set."""
-        locations = set()
-        while len(locations) < count:
-            location = (random.randint(0, self.columns - 1), random.randint(0, self.rows - 1))
-            if location not in exclude:
-                locations.add(location)
-        return locations
+        return set(self.sample_locations(count, exclude))
 
     def is_within_bounds(self, x, y):
         """Check if (x, y) is within the grid boundaries."""
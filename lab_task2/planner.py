@@ -0,0 +1,185 @@
+import heapq
+from collections import deque
+
+INFINITY = float('inf')
+
+
+class TaskPlanner:
+    """Multi-source distance field from every task location at once.
+
+    Each free cell stores its grid distance to the nearest task, which task
+    that is, and the neighbor one step closer to it. Finding the nearest
+    reachable task and the path to it is then a walk along those pointers.
+    The field tracks environment.task_locations unless another dict of
+    task locations is passed as `tasks`. As one of the environment's
+    barrier_listeners it is repaired around barriers changed with
+    update_barriers(); a new barrier_locations set rebuilds it.
+    """
+
+    def __init__(self, environment, tasks=None):
+        self.environment = environment
+        self.task_locations = tasks
+        self.rebuild()
+        environment.barrier_listeners.add(self)
+
+    def current_tasks(self):
+        if self.task_locations is not None:
+            return self.task_locations
+        return self.environment.task_locations
+
+    def rebuild(self):
+        """Recompute the whole field with one BFS seeded from every task."""
+        environment = self.environment
+        self.neighbors = environment.neighbors
+        self.occupancy = environment.occupancy
+        size = len(self.neighbors)
+        self.distance = [INFINITY] * size
+        self.source = [None] * size   # Task cell each cell is nearest to
+        self.parent = [None] * size   # Next cell on the way to that task
+        self.tasks = set(self.current_tasks())
+        self.region = {}              # Task cell -> cells it is nearest to
+
+        frontier = deque()
+        for location in self.tasks:
+            cell = environment.cell_id(*location)
+            self.distance[cell] = 0
+            self.source[cell] = cell
+            self.region[cell] = [cell]
+            frontier.append(cell)
+
+        while frontier:
+            current = frontier.popleft()
+            for next_cell in self.neighbors[current]:
+                if self.distance[next_cell] == INFINITY:
+                    self.assign(next_cell, self.distance[current] + 1, current)
+                    frontier.append(next_cell)
+
+    def assign(self, cell, distance, parent):
+        self.distance[cell] = distance
+        self.parent[cell] = parent
+        self.source[cell] = self.source[parent]
+        self.region[self.source[cell]].append(cell)
+
+    def remove_task(self, location):
+        """Drop a task and repair only the cells that were nearest to it."""
+        self.tasks.discard(location)
+        removed = self.environment.cell_id(*location)
+        # Regions also list cells that have since gone over to another task
+        cells = [cell for cell in dict.fromkeys(self.region.pop(removed, [])) if self.source[cell] == removed]
+        for cell in cells:
+            self.distance[cell] = INFINITY
+            self.source[cell] = None
+            self.parent[cell] = None
+
+        # Seed the freed region from its border with the remaining regions (tasks on barriers included)
+        occupancy = self.environment.occupancy
+        offsets = self.environment.neighbor_offsets
+        frontier = []
+        for cell in cells:
+            if occupancy[cell]:
+                continue  # The task stood on a barrier, which now stays unreached
+            for neighbor in (cell + offset for offset in offsets):
+                if self.source[neighbor] is not None:
+                    heapq.heappush(frontier, (self.distance[neighbor] + 1, cell, neighbor))
+
+        while frontier:
+            distance, cell, parent = heapq.heappop(frontier)
+            if self.distance[cell] != INFINITY:
+                continue  # Already reached at an equal or shorter distance
+            self.assign(cell, distance, parent)
+            for next_cell in self.neighbors[cell]:
+                if distance + 1 < self.distance[next_cell]:
+                    heapq.heappush(frontier, (distance + 1, next_cell, cell))
+
+    def barriers_changed(self, locations):
+        """Environment listener: repair the field around barriers that came or went.
+
+        New barriers are cleared together with every cell whose path ran
+        through them. The cleared cells and the freed barrier cells are then
+        refilled from their surroundings, and a shorter way through a freed
+        cell spreads as far as it improves distances.
+        """
+        environment = self.environment
+        occupancy = environment.occupancy
+        offsets = environment.neighbor_offsets
+        sources = {environment.cell_id(*location) for location in self.tasks}
+        cleared = []
+        for location in locations:
+            cell = environment.cell_id(*location)
+            if cell in sources:
+                continue  # A task on a barrier still spreads to its neighbors
+            if occupancy[cell]:
+                stack = [cell]
+                while stack:
+                    current = stack.pop()
+                    stack += [current + offset for offset in offsets if self.parent[current + offset] == current]
+                    self.distance[current] = INFINITY
+                    self.source[current] = None
+                    self.parent[current] = None
+                    cleared.append(current)
+            else:
+                cleared.append(cell)
+
+        # Refill from every reached neighbor, tasks standing on barriers included
+        frontier = []
+        for cell in cleared:
+            if not occupancy[cell]:
+                for neighbor in (cell + offset for offset in offsets):
+                    if self.source[neighbor] is not None:
+                        heapq.heappush(frontier, (self.distance[neighbor] + 1, cell, neighbor))
+
+        while frontier:
+            distance, cell, parent = heapq.heappop(frontier)
+            if distance > self.distance[cell]:
+                continue
+            if distance == self.distance[cell] and (self.parent[cell] != parent
+                                                    or self.source[cell] == self.source[parent]):
+                continue  # Unchanged, unless its parent has just gone over to another task
+            self.assign(cell, distance, parent)
+            for next_cell in self.neighbors[cell]:
+                if distance + 1 < self.distance[next_cell] or self.parent[next_cell] == cell:
+                    heapq.heappush(frontier, (distance + 1, next_cell, cell))
+
+    def close(self):
+        self.environment.barrier_listeners.discard(self)
+
+    def sync(self):
+        """Bring the field in line with the tracked task locations."""
+        current = self.current_tasks().keys()
+        if (self.occupancy is not self.environment.occupancy
+                or any(location not in self.tasks for location in current)):
+            self.rebuild()  # New barrier_locations or tasks added back, e.g. after a reset
+            return
+        for location in self.tasks - current:
+            self.remove_task(location)
+
+    def nearest_task(self, start):
+        """Return the nearest reachable task location from start, or None."""
+        self.sync()
+        cell = self.environment.cell_id(*start)
+        if self.source[cell] is None:
+            return None
+        return self.environment.cell_location(self.source[cell])
+
+    def cell_path_to_nearest(self, cell, sync=True):
+        """Cell ids (excluding cell) to the nearest reachable task, or None if there is none.
+
+        Callers that report every removal through remove_task() can pass
+        sync=False to skip comparing the field against the task dict.
+        """
+        if sync:
+            self.sync()
+        if self.source[cell] is None:
+            return None
+        path = []
+        while self.parent[cell] is not None:
+            cell = self.parent[cell]
+            path.append(cell)
+        return path
+
+    def path_to_nearest(self, start):
+        """Path (excluding start) to the nearest reachable task, in O(path length)."""
+        path = self.cell_path_to_nearest(self.environment.cell_id(*start))
+        if path is None:
+            return []
+        return [self.environment.cell_location(cell) for cell in path]
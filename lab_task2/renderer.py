@@ -0,0 +1,162 @@
+import pygame
+
+BACKGROUND_COLOR = (255, 255, 255)
+GRID_LINE_COLOR = (200, 200, 200)
+BARRIER_COLOR = (0, 0, 0)
+TASK_COLOR = (255, 0, 0)
+TASK_TEXT_COLOR = (255, 255, 255)
+AGENT_COLOR = (0, 0, 255)
+TEXT_COLOR = (0, 0, 0)
+BUTTON_COLOR = (0, 200, 0)
+BUTTON_TEXT_COLOR = (255, 255, 255)
+LINE_HEIGHT = 25
+
+
+class GridRenderer:
+    """Draws the grid view, updating only the rectangles that changed.
+
+    Grid lines and barriers are pre-rendered into a background surface that
+    is rebuilt only for a new barrier_locations set; as one of the
+    environment's barrier_listeners the renderer repaints just the cells
+    update_barriers() changed. Task numbers and button labels, a small fixed
+    set of strings, are rendered once and cached; panel lines change every
+    tick, so they are rendered as they change and never kept. Each frame
+    redraws just the cells whose barrier, task or agent changed, the panel
+    lines whose text changed and the buttons whose label changed, and passes
+    those rectangles to pygame.display.update().
+    """
+
+    def __init__(self, screen, font, grid_size, panel_x):
+        self.screen = screen
+        self.font = font
+        self.grid_size = grid_size
+        self.panel_x = panel_x
+        self.text_cache = {}
+        self.background = None
+        self.environment = None     # Environment whose barrier changes are listened to
+        self.occupancy = None       # Occupancy grid the background was built from
+        self.changed_cells = set()  # Cells whose barrier changed since the last draw()
+        self.drawn_tasks = {}       # Location -> task number currently on screen
+        self.drawn_agents = set()   # Cells agents are currently drawn in
+        self.drawn_lines = []       # Panel text currently on screen, line by line
+        self.drawn_buttons = {}     # Button rect -> label currently on screen
+
+    def text(self, string, color):
+        surface = self.text_cache.get((string, color))
+        if surface is None:
+            surface = self.text_cache[(string, color)] = self.font.render(string, True, color)
+        return surface
+
+    def build_background(self, environment):
+        self.background = pygame.Surface(self.screen.get_size())
+        self.background.fill(BACKGROUND_COLOR)
+        for x in range(environment.columns):
+            for y in range(environment.rows):
+                pygame.draw.rect(self.background, GRID_LINE_COLOR, self.cell_rect((x, y)), 1)
+        for location in environment.barrier_locations:
+            pygame.draw.rect(self.background, BARRIER_COLOR, self.cell_rect(location))
+        self.occupancy = environment.occupancy
+        self.changed_cells = set()
+        if self.environment is not environment:
+            if self.environment is not None:
+                self.environment.barrier_listeners.discard(self)
+            environment.barrier_listeners.add(self)
+            self.environment = environment
+
+    def barriers_changed(self, locations):
+        """Environment listener: repaint the changed cells of the background; draw() shows them."""
+        if self.background is None:
+            return
+        barriers = self.environment.barrier_locations
+        for location in locations:
+            rect = self.cell_rect(location)
+            self.background.fill(BACKGROUND_COLOR, rect)
+            if location in barriers:
+                pygame.draw.rect(self.background, BARRIER_COLOR, rect)
+            else:
+                pygame.draw.rect(self.background, GRID_LINE_COLOR, rect, 1)
+        self.changed_cells.update(locations)
+
+    def cell_rect(self, location):
+        return pygame.Rect(location[0] * self.grid_size, location[1] * self.grid_size,
+                           self.grid_size, self.grid_size)
+
+    def invalidate(self):
+        """Force the next draw() to repaint the whole window, e.g. after the window was exposed."""
+        self.occupancy = None
+
+    def draw(self, environment, agent_cells, panel_texts, buttons):
+        """Bring the window up to date.
+
+        agent_cells is a set of (x, y) agent locations and buttons holds
+        (rect, label) pairs, a label of None hiding the button.
+        """
+        dirty = []
+        if environment.occupancy is not self.occupancy:
+            # New barrier set (or first frame): start again from a fresh background
+            self.build_background(environment)
+            self.screen.blit(self.background, (0, 0))
+            self.drawn_tasks = {}
+            self.drawn_agents = set()
+            self.drawn_lines = []
+            self.drawn_buttons = {}
+            dirty.append(self.screen.get_rect())
+
+        # Grid cells whose task or agents changed
+        tasks = environment.task_locations
+        cells = {location for location in self.drawn_tasks if tasks.get(location) != self.drawn_tasks[location]}
+        cells.update(location for location in tasks if self.drawn_tasks.get(location) != tasks[location])
+        cells.update(self.drawn_agents.symmetric_difference(agent_cells))
+        cells.update(self.changed_cells)
+        self.changed_cells = set()
+        for location in cells:
+            dirty.append(self.draw_cell(location, tasks, agent_cells))
+        self.drawn_tasks = dict(tasks)
+        self.drawn_agents = set(agent_cells)
+
+        # Panel lines whose text changed
+        y_offset = 20
+        for i, text in enumerate(panel_texts):
+            if i >= len(self.drawn_lines) or self.drawn_lines[i] != text:
+                dirty.append(self.draw_line(text, y_offset))
+            y_offset += LINE_HEIGHT
+        for i in range(len(panel_texts), len(self.drawn_lines)):
+            dirty.append(self.draw_line("", 20 + i * LINE_HEIGHT))
+        self.drawn_lines = list(panel_texts)
+
+        # Buttons whose label changed
+        for rect, label in buttons:
+            if self.drawn_buttons.get(tuple(rect)) != label:
+                dirty.append(self.draw_button(rect, label))
+                self.drawn_buttons[tuple(rect)] = label
+
+        if dirty:
+            pygame.display.update(dirty)
+
+    def draw_cell(self, location, tasks, agent_cells):
+        rect = self.cell_rect(location)
+        self.screen.blit(self.background, rect, rect)
+        if location in tasks:
+            pygame.draw.rect(self.screen, TASK_COLOR, rect)
+            # Center the task number in the task square
+            task_text = self.text(str(tasks[location]), TASK_TEXT_COLOR)
+            self.screen.blit(task_text, task_text.get_rect(center=rect.center).topleft)
+        if location in agent_cells:
+            pygame.draw.rect(self.screen, AGENT_COLOR, rect)
+        return rect
+
+    def draw_line(self, text, y_offset):
+        rect = pygame.Rect(self.panel_x, y_offset, self.screen.get_width() - self.panel_x, LINE_HEIGHT)
+        self.screen.blit(self.background, rect, rect)
+        if text:
+            self.screen.blit(self.font.render(text, True, TEXT_COLOR), (self.panel_x, y_offset))
+        return rect
+
+    def draw_button(self, rect, label):
+        """Draws a button with text, or clears it when label is None."""
+        self.screen.blit(self.background, rect, rect)
+        if label is not None:
+            pygame.draw.rect(self.screen, BUTTON_COLOR, rect)
+            text_surface = self.text(label, BUTTON_TEXT_COLOR)
+            self.screen.blit(text_surface, text_surface.get_rect(center=rect.center))
+        return rect
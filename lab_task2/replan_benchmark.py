@@ -0,0 +1,109 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+from benchmark import make_environment
+from replanner import DStarLite
+from search import a_star
+
+FIELDS = ['columns', 'rows', 'barrier_density', 'seed', 'replans', 'path_mismatches',
+          'initial_time', 'dstar_time', 'astar_time', 'dstar_expanded', 'astar_expanded',
+          'time_per_dstar_replan', 'time_per_astar_replan']
+
+
+def run_case(environment, replans, moves_per_replan):
+    """Walk from one corner to the other while barriers keep landing on the path ahead.
+
+    After every `moves_per_replan` steps a barrier is added to the remaining
+    path and, if any are left, the oldest barrier is removed. D* Lite repairs
+    its search (the time includes the barrier update that notifies it);
+    A* searches again from scratch. Both must return equally long paths.
+    """
+    start, goal = (0, 0), (environment.columns - 1, environment.rows - 1)
+    environment.update_barriers(removed=[start, goal])
+    rng = environment.rng
+    result = {'replans': 0, 'path_mismatches': 0, 'dstar_time': 0.0, 'astar_time': 0.0,
+              'dstar_expanded': 0, 'astar_expanded': 0}
+
+    begin = time.perf_counter()
+    planner = DStarLite(environment, start, goal)
+    path = planner.plan()
+    result['initial_time'] = time.perf_counter() - begin
+
+    position = start
+    barriers = sorted(environment.barrier_locations)
+    while path and result['replans'] < replans:
+        for location in path[:moves_per_replan]:
+            position = location
+        path = path[moves_per_replan:]
+        planner.move_to(position)
+        if len(path) < 2:
+            break
+
+        added = [path[int(rng.integers(len(path) - 1))]]  # Never the goal itself
+        removed = [barriers.pop(0)] if barriers else []
+        barriers += added
+
+        begin = time.perf_counter()
+        environment.update_barriers(added, removed)
+        path = planner.plan()
+        result['dstar_time'] += time.perf_counter() - begin
+        result['dstar_expanded'] += planner.last_stats['expanded']
+
+        begin = time.perf_counter()
+        astar_path, stats = a_star(environment, position, [goal])
+        result['astar_time'] += time.perf_counter() - begin
+        result['astar_expanded'] += stats['expanded']
+
+        result['replans'] += 1
+        if len(path) != len(astar_path):
+            result['path_mismatches'] += 1
+
+    planner.close()
+    replans = max(result['replans'], 1)
+    result['time_per_dstar_replan'] = result['dstar_time'] / replans
+    result['time_per_astar_replan'] = result['astar_time'] / replans
+    return result
+
+
+def run_benchmark(sizes, densities, seeds, replans, moves_per_replan):
+    rows = []
+    for size in sizes:
+        for density in densities:
+            for seed in range(seeds):
+                environment = make_environment(size, density, 0, seed)
+                row = {'columns': size, 'rows': size, 'barrier_density': density, 'seed': seed}
+                row.update(run_case(environment, replans, moves_per_replan))
+                rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare D* Lite replanning with full A* as barriers change.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50, 100, 200])
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.0, 0.1, 0.25])
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeded grids per setting")
+    parser.add_argument("--replans", type=int, default=20, help="barrier changes per grid")
+    parser.add_argument("--moves", type=int, default=5, help="agent steps between barrier changes")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.sizes, args.densities, args.seeds, args.replans, args.moves)
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    if args.format == "json":
+        json.dump(rows, output, indent=2)
+        output.write("\n")
+    else:
+        writer = csv.DictWriter(output, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    if args.output:
+        output.close()
+
+
+if __name__ == "__main__":
+    main()
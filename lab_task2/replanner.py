@@ -0,0 +1,138 @@
+import heapq
+
+INFINITY = float('inf')
+
+
+class DStarLite:
+    """Incremental shortest path from a moving start to a fixed goal (D* Lite).
+
+    The search runs backwards from the goal and keeps its g/rhs values and
+    priority queue between calls. The planner registers itself with the
+    environment's barrier_listeners, so after Environment.update_barriers()
+    only the cells whose distance to the goal changed are searched again.
+    move_to() follows the agent without throwing anything away. Replacing
+    barrier_locations wholesale is not reported, so a planner whose
+    `occupancy` is no longer the environment's has to be replaced.
+    plan() leaves the counters of the work done since the previous plan()
+    (including the requeueing after barrier changes) in `last_stats`.
+    """
+
+    def __init__(self, environment, start, goal):
+        self.environment = environment
+        self.rows = environment.padded_rows
+        self.goal = environment.cell_id(*goal)
+        self.start = self.last = environment.cell_id(*start)
+        self.occupancy = environment.occupancy  # The grid the search state is valid for
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.km = 0
+        self.queue = []
+        self.queued = {}  # Cell -> key of its live queue entry; other entries are stale
+        self.stats = self.new_stats()
+        self.last_stats = self.new_stats()
+        self.push(self.goal)
+        environment.barrier_listeners.add(self)
+
+    @staticmethod
+    def new_stats():
+        return {'expanded': 0, 'pushed': 0, 'stale_pops': 0, 'peak_frontier': 0, 'visited': 0}
+
+    def heuristic(self, cell):
+        """Manhattan distance from the current start."""
+        x, y = divmod(cell, self.rows)
+        start_x, start_y = divmod(self.start, self.rows)
+        return abs(x - start_x) + abs(y - start_y)
+
+    def key(self, cell):
+        best = min(self.g.get(cell, INFINITY), self.rhs.get(cell, INFINITY))
+        return (best + self.heuristic(cell) + self.km, best)
+
+    def push(self, cell):
+        key = self.key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, cell))
+        self.stats['pushed'] += 1
+
+    def update_vertex(self, cell):
+        if cell != self.goal:
+            g = self.g
+            self.rhs[cell] = min((g.get(next_cell, INFINITY) + 1 for next_cell in self.environment.neighbors[cell]),
+                                 default=INFINITY)
+        self.queued.pop(cell, None)  # Any queued entry goes stale
+        if self.g.get(cell, INFINITY) != self.rhs.get(cell, INFINITY):
+            self.push(cell)
+
+    def predecessors(self, cell):
+        """Cells that may step onto cell: its grid neighbors, barriers included, since a
+        start on a barrier can still leave it."""
+        return [cell + offset for offset in self.environment.neighbor_offsets]
+
+    def compute_shortest_path(self):
+        queue, queued, g, rhs, stats = self.queue, self.queued, self.g, self.rhs, self.stats
+        start = self.start
+        while queue:
+            stats['peak_frontier'] = max(stats['peak_frontier'], len(queue))
+            key, cell = queue[0]
+            if queued.get(cell) != key:
+                heapq.heappop(queue)
+                stats['stale_pops'] += 1
+                continue
+            start_key = self.key(start)
+            if key >= start_key and rhs.get(start, INFINITY) == g.get(start, INFINITY):
+                break
+            heapq.heappop(queue)
+            del queued[cell]
+            new_key = self.key(cell)
+            if key < new_key:
+                self.push(cell)  # Its key grew with km since it was queued
+                continue
+            stats['expanded'] += 1
+            if g.get(cell, INFINITY) > rhs.get(cell, INFINITY):
+                g[cell] = rhs[cell]
+                for predecessor in self.predecessors(cell):
+                    self.update_vertex(predecessor)
+            else:
+                g[cell] = INFINITY
+                self.update_vertex(cell)
+                for predecessor in self.predecessors(cell):
+                    self.update_vertex(predecessor)
+
+    def move_to(self, location):
+        """The agent moved; later plans start from location."""
+        self.start = self.environment.cell_id(*location)
+
+    def catch_up(self):
+        """Raise km by how far the start moved since the last search or change, so
+        the keys already queued stay lower bounds for the new start."""
+        self.km += self.heuristic(self.last)
+        self.last = self.start
+
+    def barriers_changed(self, locations):
+        """Environment listener: requeue the changed cells and everything next to them."""
+        self.catch_up()
+        self.occupancy = self.environment.occupancy
+        for location in locations:
+            cell = self.environment.cell_id(*location)
+            self.update_vertex(cell)
+            for predecessor in self.predecessors(cell):
+                self.update_vertex(predecessor)
+
+    def plan(self):
+        """Shortest path (excluding start) from the current start to the goal, or [] if none."""
+        self.catch_up()
+        self.compute_shortest_path()
+        self.stats['visited'] = len(self.g)
+        self.last_stats, self.stats = self.stats, self.new_stats()
+        g = self.g
+        neighbors = self.environment.neighbors
+        cell = self.start
+        if g.get(cell, INFINITY) == INFINITY:
+            return []
+        path = []
+        while cell != self.goal:
+            cell = min(neighbors[cell], key=lambda next_cell: g.get(next_cell, INFINITY))
+            path.append(self.environment.cell_location(cell))
+        return path
+
+    def close(self):
+        self.environment.barrier_listeners.discard(self)
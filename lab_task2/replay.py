@@ -0,0 +1,167 @@
+import argparse
+import collections
+import sys
+
+from environment import Environment
+from eventlog import read_events
+from loop import FixedStepLoop
+
+# Event kinds written by run.py and simulation.py:
+#   environment  columns, rows, barriers [[x, y]], tasks [[x, y, number]], agents [[x, y]], algorithm
+#   moves        tick, agents, x, y (parallel lists of the agents that moved)
+#   task         tick, agent, task, x, y
+#   search       tick, agent, algorithm, path_length and the search's stats
+#   barriers     tick, added [[x, y]], removed [[x, y]]
+
+
+def log_environment(log, environment, agents, algorithm=None):
+    """Record the grid, tasks and agent starts that the following events apply to."""
+    log.write('environment', columns=environment.columns, rows=environment.rows,
+              barriers=sorted(environment.barrier_locations),
+              tasks=[[x, y, number] for (x, y), number in environment.task_locations.items()],
+              agents=[list(agent) for agent in agents], algorithm=algorithm)
+
+
+def environment_from_event(record, grid_size=1):
+    environment = Environment(record['columns'] * grid_size, record['rows'] * grid_size, grid_size,
+                              num_tasks=0, num_barriers=0)
+    environment.barrier_locations = {tuple(location) for location in record['barriers']}
+    environment.task_locations = {(x, y): number for x, y, number in record['tasks']}
+    return environment
+
+
+class Replay:
+    """Rebuilds a logged run tick by tick from its events.
+
+    An environment event (re)starts the run; every step() then applies all
+    events of the next logged tick and returns False once the log is done.
+    """
+
+    def __init__(self, events, grid_size=1):
+        self.events = iter(events)
+        self.grid_size = grid_size
+        self.pending = None
+        self.environment = None
+        self.tick = None
+
+    def reset(self, record):
+        self.environment = environment_from_event(record, self.grid_size)
+        self.positions = [tuple(agent) for agent in record['agents']]
+        self.algorithm = record.get('algorithm')
+        self.tasks_completed = [0] * len(self.positions)
+        self.completed_tasks = []
+        self.path_cost = 0
+        self.search_stats = {}
+        self.tick = None
+
+    def apply(self, record):
+        event = record['event']
+        if event == 'environment':
+            self.reset(record)
+        elif event == 'moves':
+            for agent, x, y in zip(record['agents'], record['x'], record['y']):
+                self.positions[agent] = (x, y)
+            self.path_cost += len(record['agents'])
+        elif event == 'task':
+            self.environment.task_locations.pop((record['x'], record['y']), None)
+            self.tasks_completed[record['agent']] += 1
+            self.completed_tasks.append(record['task'])
+        elif event == 'barriers':
+            self.environment.update_barriers([tuple(location) for location in record['added']],
+                                             [tuple(location) for location in record['removed']])
+        elif event == 'search':
+            self.algorithm = record['algorithm']
+            self.search_stats = record
+
+    def step(self):
+        applied = False
+        while True:
+            record = self.pending if self.pending is not None else next(self.events, None)
+            self.pending = None
+            if record is None:
+                return applied
+            tick = record.get('tick')
+            if tick is not None and applied and tick != self.tick:
+                self.pending = record  # First event of the next tick
+                return True
+            self.apply(record)
+            applied = True
+            if tick is not None:
+                self.tick = tick
+
+    def panel_texts(self):
+        stats = self.search_stats
+        return [
+            f"Replay Tick: {self.tick if self.tick is not None else 0}",
+            f"Algorithm: {self.algorithm}",
+            f"Agents: {len(self.positions)}",
+            f"Tasks Completed: {sum(self.tasks_completed)}",
+            f"Tasks Left: {len(self.environment.task_locations)}",
+            f"Total Path Cost: {self.path_cost}",
+            f"Last Search: {stats.get('expanded', 0)} expanded, {stats.get('stale_pops', 0)} stale",
+            f"  Peak Frontier: {stats.get('peak_frontier', 0)}, Visited: {stats.get('visited', 0)}",
+        ]
+
+
+def summarize(path):
+    """Tally a log without holding it in memory."""
+    counts = collections.Counter()
+    moves = 0
+    for record in read_events(path):
+        counts[record['event']] += 1
+        if record['event'] == 'moves':
+            moves += len(record['agents'])
+    for event, count in sorted(counts.items()):
+        print(f"{event}: {count}")
+    print(f"Agent moves: {moves}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a logged grid run in the pygame view.")
+    parser.add_argument("log", help="event log written with --log")
+    parser.add_argument("--tick-rate", type=float, default=5, help="logged ticks replayed per second")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--max-speed", action="store_true")
+    parser.add_argument("--summary", action="store_true", help="print event counts instead of drawing")
+    args = parser.parse_args()
+
+    if args.summary:
+        summarize(args.log)
+        return
+
+    import pygame
+    from renderer import GridRenderer
+    from run import GRID_SIZE, STATUS_WIDTH, WINDOW_HEIGHT, WINDOW_WIDTH
+
+    # Size the cells so the logged grid fits the usual window
+    first = next(read_events(args.log, {'environment'}))
+    grid_size = max(1, min(GRID_SIZE, WINDOW_WIDTH // first['columns'], WINDOW_HEIGHT // first['rows']))
+    replay = Replay(read_events(args.log), grid_size)
+    replay.step()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH + STATUS_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption(f"Replay: {args.log}")
+    renderer = GridRenderer(screen, pygame.font.Font(None, 24), grid_size, WINDOW_WIDTH + 10)
+
+    def render():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.VIDEOEXPOSE:
+                renderer.invalidate()  # The window lost what was drawn only in dirty rects
+        renderer.draw(replay.environment, set(replay.positions), replay.panel_texts(), [])
+
+    FixedStepLoop(replay.step, args.tick_rate, render=render, frame_rate=args.fps,
+                  max_speed=args.max_speed).run()
+
+    # Keep the finished replay on screen until the window is closed
+    while render() is not False:
+        pygame.time.wait(50)
+
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
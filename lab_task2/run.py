@@ -1,172 +1,196 @@
-import pygame
+import argparse
 import sys
 from agent import Agent
 from environment import Environment
+from eventlog import EventWriter
+from loop import FixedStepLoop
+from replay import log_environment
+from search import SEARCHES
 
 # Constants
 WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
 GRID_SIZE = 40
 STATUS_WIDTH = 250
-BACKGROUND_COLOR = (255, 255, 255)
-BARRIER_COLOR = (0, 0, 0)
-TASK_COLOR = (255, 0, 0)
-AGENT_COLOR = (0, 0, 255)
-TEXT_COLOR = (0, 0, 0)
-BUTTON_COLOR = (0, 200, 0)
-BUTTON_TEXT_COLOR = (255, 255, 255)
-MOVEMENT_DELAY = 200  # Movement delay in milliseconds
-
-def draw_button(screen, rect, text, font):
-    """Draws a button with text."""
-    pygame.draw.rect(screen, BUTTON_COLOR, rect)
-    text_surface = font.render(text, True, BUTTON_TEXT_COLOR)
-    text_rect = text_surface.get_rect(center=rect.center)
-    screen.blit(text_surface, text_rect)
-
-def draw_panel(screen, font, agent, environment, path_cost, ucs_results, astar_results):
-    """Draws the status panel showing both algorithms results."""
-    status_x = WINDOW_WIDTH + 10
-    y_offset = 20
-    panel_texts = [
+TICK_RATE = 5  # Agent moves per second
+FRAME_RATE = 60
+ALGORITHMS = list(SEARCHES)
+
+def next_algorithm(algorithm):
+    """Returns the algorithm the toggle button switches to."""
+    return ALGORITHMS[(ALGORITHMS.index(algorithm) + 1) % len(ALGORITHMS)]
+
+def change_barriers(environment, rate, keep):
+    """Add a barrier on a random cell and remove a random barrier, each with probability
+    `rate`; tasks and the `keep` locations are never blocked. Returns (added, removed)."""
+    rng = environment.rng
+    added, removed = [], []
+    if rng.random() < rate:
+        location = (int(rng.integers(environment.columns)), int(rng.integers(environment.rows)))
+        if location not in keep and location not in environment.task_locations:
+            added.append(location)
+    if environment.barrier_locations and rng.random() < rate:
+        barriers = sorted(environment.barrier_locations)
+        removed.append(barriers[rng.integers(len(barriers))])
+    changed = environment.update_barriers(added, removed)
+    return [location for location in added if location in changed], [location for location in removed if location in changed]
+
+def panel_texts(agent, path_cost, results):
+    """Lines of the status panel showing every algorithm's results."""
+    stats = agent.search_stats
+    texts = [
         f"Current Algorithm: {agent.algorithm}",
         f"Tasks Completed: {agent.task_completed}",
         f"Position: {agent.position}",
         f"Completed Tasks: {list(agent.completed_tasks)}",
         f"Total Path Cost (Current): {path_cost}",
-        "",
-        f"A* Algorithm:",
-        f"Tasks Completed: {astar_results['tasks_completed']}",
-        f"Path Cost: {astar_results['path_cost']}","",
-        f"UCS Algorithm:",
-        f"Tasks Completed: {ucs_results['tasks_completed']}",
-        f"Path Cost: {ucs_results['path_cost']}",
+        f"Last Search: {stats.get('expanded', 0)} expanded, {stats.get('stale_pops', 0)} stale",
+        f"  Peak Frontier: {stats.get('peak_frontier', 0)}, Visited: {stats.get('visited', 0)}",
     ]
-    for text in panel_texts:
-        text_surface = font.render(text, True, TEXT_COLOR)
-        screen.blit(text_surface, (status_x, y_offset))
-        y_offset += 30
+    # One line per algorithm, so the list stays clear of the buttons
+    for algorithm in ALGORITHMS:
+        texts.append(f"{algorithm}: {results[algorithm]['tasks_completed']} tasks, "
+                     f"cost {results[algorithm]['path_cost']}")
+    return texts
 
 def main():
-    pygame.init()
-
-    # Set up display with a side panel
-    screen = pygame.display.set_mode((WINDOW_WIDTH + STATUS_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("Pygame AI Grid Simulation")
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 24)
+    parser = argparse.ArgumentParser(description="Watch an agent search its way through a grid of tasks.")
+    parser.add_argument("--tick-rate", type=float, default=TICK_RATE, help="agent moves per second")
+    parser.add_argument("--fps", type=float, default=FRAME_RATE, help="frames per second of the view")
+    parser.add_argument("--max-speed", action="store_true", help="move the agent as fast as possible")
+    parser.add_argument("--no-render", action="store_true",
+                        help="run without a window, starting at once and stopping when the tasks are done")
+    parser.add_argument("--algorithm", default="A*", choices=ALGORITHMS)
+    parser.add_argument("--log", help="write an event log of the run here (replay it with replay.py)")
+    parser.add_argument("--seed", type=int, help="seed for a reproducible grid")
+    parser.add_argument("--dynamic-barriers", type=float, default=0, metavar="RATE",
+                        help="chance per tick that a barrier appears, and that one disappears")
+    args = parser.parse_args()
 
     # Initialize environment and agent
-    environment = Environment(WINDOW_WIDTH, WINDOW_HEIGHT, GRID_SIZE, num_tasks=5, num_barriers=15)
+    environment = Environment(WINDOW_WIDTH, WINDOW_HEIGHT, GRID_SIZE, num_tasks=5, num_barriers=15, seed=args.seed)
     agent = Agent(environment, GRID_SIZE)
+    agent.algorithm = args.algorithm
 
     # Store the initial state of tasks and barriers
     initial_task_locations = environment.task_locations.copy()
     initial_barrier_locations = environment.barrier_locations.copy()
 
-    # Variables to track the results of both algorithms
-    ucs_results = {'tasks_completed': 0, 'path_cost': 0}
-    astar_results = {'tasks_completed': 0, 'path_cost': 0}
-
-    # Button setup
-    start_button_rect = pygame.Rect(WINDOW_WIDTH + 50, WINDOW_HEIGHT - 140, 150, 50)
-    toggle_button_rect = pygame.Rect(WINDOW_WIDTH + 50, WINDOW_HEIGHT - 70, 150, 50)
+    # Variables to track the results of every algorithm
+    results = {algorithm: {'tasks_completed': 0, 'path_cost': 0} for algorithm in ALGORITHMS}
 
     # Variables to control simulation
-    start_simulation = False
+    start_simulation = args.no_render
     current_path = []
-    last_move_time = pygame.time.get_ticks()
     total_path_cost = 0
-
-    running = True
-    while running:
-        screen.fill(BACKGROUND_COLOR)
-
+    tick = 0
+
+    log = EventWriter(args.log) if args.log else None
+    if log:
+        log_environment(log, environment, [agent.position], agent.algorithm)
+
+    def update():
+        """One simulation tick: plan if needed and move the agent one cell."""
+        nonlocal start_simulation, current_path, total_path_cost, tick
+        if not (start_simulation and environment.task_locations):
+            return not args.no_render  # Headless runs end once the tasks are done
+        tick += 1
+        completed = len(agent.completed_tasks)
+
+        if args.dynamic_barriers:
+            added, removed = change_barriers(environment, args.dynamic_barriers, {tuple(agent.position)})
+            if added or removed:
+                current_path = []  # Replan on the changed grid
+                if log:
+                    log.write('barriers', tick=tick, added=added, removed=removed)
+
+        if not current_path:
+            current_path = agent.plan()
+            if log and environment.task_locations:
+                log.write('search', tick=tick, agent=0, algorithm=agent.algorithm,
+                          path_length=len(current_path), **agent.search_stats)
+            if not current_path and args.no_render:
+                return False  # Remaining tasks are unreachable
+
+        if current_path:
+            next_step = current_path.pop(0)
+            agent.position = [next_step[0], next_step[1]]
+            total_path_cost += 1
+            agent.check_task_completion()
+            if log:
+                log.write('moves', tick=tick, agents=[0], x=[next_step[0]], y=[next_step[1]])
+
+        if log:
+            for task_number in agent.completed_tasks[completed:]:
+                log.write('task', tick=tick, agent=0, task=task_number,
+                          x=agent.position[0], y=agent.position[1])
+
+        if not environment.task_locations:
+            start_simulation = False
+
+        # Update algorithm results
+        results[agent.algorithm]['tasks_completed'] = agent.task_completed
+        results[agent.algorithm]['path_cost'] = total_path_cost
+
+    def render():
+        """One frame: handle input and redraw what changed."""
+        nonlocal start_simulation, current_path, total_path_cost
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False
+                return False
+            elif event.type == pygame.VIDEOEXPOSE:
+                renderer.invalidate()  # The window lost what was drawn only in dirty rects
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if not start_simulation and start_button_rect.collidepoint(event.pos):
                     start_simulation = True
                 elif toggle_button_rect.collidepoint(event.pos):
                     # Toggle between algorithms and reset environment
-                    agent.algorithm = "UCS" if agent.algorithm == "A*" else "A*"
+                    agent.algorithm = next_algorithm(agent.algorithm)
                     current_path = []  # Reset path
                     start_simulation = False  # Reset the simulation flag
-                    
+
                     # Reset the environment to its initial state
                     environment.task_locations = initial_task_locations.copy()
                     environment.barrier_locations = initial_barrier_locations.copy()
                     agent.position = [0, 0]
-                    agent.rect.topleft = (0, 0)
                     agent.task_completed = 0
                     agent.completed_tasks = []
+                    if log:
+                        log_environment(log, environment, [agent.position], agent.algorithm)
+
+        # Redraw only what changed since the last frame
+        buttons = [
+            (start_button_rect, None if start_simulation else "Start"),
+            (toggle_button_rect, f"Toggle to {next_algorithm(agent.algorithm)}"),
+        ]
+        renderer.draw(environment, {tuple(agent.position)}, panel_texts(agent, total_path_cost, results), buttons)
+
+    if args.no_render:
+        FixedStepLoop(update, args.tick_rate, max_speed=args.max_speed).run()
+        if log:
+            log.close()
+        for text in panel_texts(agent, total_path_cost, results):
+            print(text)
+        return
+
+    # pygame is only needed for the window, so headless runs never import it
+    import pygame
+    from renderer import GridRenderer
+
+    pygame.init()
+
+    # Button setup
+    start_button_rect = pygame.Rect(WINDOW_WIDTH + 50, WINDOW_HEIGHT - 140, 150, 50)
+    toggle_button_rect = pygame.Rect(WINDOW_WIDTH + 50, WINDOW_HEIGHT - 70, 150, 50)
+
+    # Set up display with a side panel
+    screen = pygame.display.set_mode((WINDOW_WIDTH + STATUS_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Pygame AI Grid Simulation")
+    font = pygame.font.Font(None, 24)
+    renderer = GridRenderer(screen, font, GRID_SIZE, WINDOW_WIDTH + 10)
 
-        # Draw the grid
-        for x in range(environment.columns):
-            for y in range(environment.rows):
-                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(screen, (200, 200, 200), rect, 1)
-
-        # Draw barriers
-        for bx, by in environment.barrier_locations:
-            pygame.draw.rect(screen, BARRIER_COLOR, pygame.Rect(bx * GRID_SIZE, by * GRID_SIZE, GRID_SIZE, GRID_SIZE))
-
-        # Draw tasks
-        for (tx, ty), task_number in environment.task_locations.items():
-            task_rect = pygame.Rect(tx * GRID_SIZE, ty * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(screen, TASK_COLOR, task_rect)
-            task_text = font.render(str(task_number), True, (255, 255, 255))
-
-            # Calculate the position to center the task number in the task square
-            text_rect = task_text.get_rect(center=task_rect.center)
-            screen.blit(task_text, text_rect.topleft)
-
-        # Draw agent
-        pygame.draw.rect(screen, AGENT_COLOR, agent.rect)
-
-        # Draw the Start button only if the simulation hasn't started
-        if not start_simulation:
-            draw_button(screen, start_button_rect, "Start", font)
-
-        # Draw the Toggle button
-        toggle_text = f"Toggle to {'UCS' if agent.algorithm == 'A*' else 'A*'}"
-        draw_button(screen, toggle_button_rect, toggle_text, font)
-
-        # Status panel
-        draw_panel(screen, font, agent, environment, total_path_cost, ucs_results, astar_results)
-
-        # Simulation logic
-        if start_simulation and environment.task_locations:
-            if agent.algorithm == "UCS" and not current_path:
-                current_path = agent.ucs()
-            elif agent.algorithm == "A*" and not current_path:
-                current_path = agent.a_star()
-
-            if current_path:
-                current_time = pygame.time.get_ticks()
-                if current_time - last_move_time > MOVEMENT_DELAY:
-                    next_step = current_path.pop(0)
-                    agent.position = [next_step[0], next_step[1]]
-                    agent.rect.topleft = (next_step[0] * GRID_SIZE, next_step[1] * GRID_SIZE)
-                    last_move_time = current_time
-                    total_path_cost += 1
-                    agent.check_task_completion()
-
-            if not environment.task_locations:
-                start_simulation = False
-            
-            
-
-            # Update algorithm results
-            if agent.algorithm == "UCS":
-                ucs_results['tasks_completed'] = agent.task_completed
-                ucs_results['path_cost'] = total_path_cost
-            elif agent.algorithm == "A*":
-                astar_results['tasks_completed'] = agent.task_completed
-                astar_results['path_cost'] = total_path_cost
-
-        pygame.display.flip()
-        clock.tick(60)
+    FixedStepLoop(update, args.tick_rate, render=render, frame_rate=args.fps, max_speed=args.max_speed).run()
+    if log:
+        log.close()
 
     pygame.quit()
     sys.exit()
@@ -0,0 +1,413 @@
+import heapq
+
+from planner import TaskPlanner
+from replanner import DStarLite
+from tour import tour_order
+
+# Registered search strategies, in the order the UI cycles through them.
+# Every strategy is called as search(environment, start, goals, hooks=None)
+# with (x, y) locations and returns (path, stats): the path excludes start and
+# ends on the goal reached, or is empty if no goal is reachable. stats holds
+# the counters listed in STAT_FIELDS.
+SEARCHES = {}
+
+STAT_FIELDS = ['expanded', 'pushed', 'stale_pops', 'peak_frontier', 'visited']
+
+
+class SearchHooks:
+    """Optional callbacks a search reports into, all taking a cell id.
+
+    on_push(cell, priority) runs for every frontier push, on_pop(cell) for
+    every pop (including stale entries) and on_expand(cell) for every cell
+    whose neighbors are generated. Searches only test the hooks for None,
+    so leaving them unset costs next to nothing.
+    """
+
+    def __init__(self, on_push=None, on_pop=None, on_expand=None):
+        self.on_push = on_push
+        self.on_pop = on_pop
+        self.on_expand = on_expand
+
+
+NO_HOOKS = SearchHooks()
+
+
+def register(name):
+    """Decorator adding a search strategy to SEARCHES under name."""
+    def decorator(search):
+        SEARCHES[name] = search
+        return search
+    return decorator
+
+
+def release_planners(environment, keep=None):
+    """Drop the planners strategies keep on environment, except the one of strategy `keep`.
+
+    Planners that listen for barrier changes stop listening, so a strategy
+    that is no longer used costs nothing.
+    """
+    for name in [name for name in environment.planners if name != keep]:
+        planner = environment.planners.pop(name)
+        if hasattr(planner, 'close'):
+            planner.close()
+
+
+def nearest_goal(start, goals):
+    """Return the goal nearest to start by Manhattan distance."""
+    return min(goals, key=lambda goal: abs(start[0] - goal[0]) + abs(start[1] - goal[1]))
+
+
+def search_stats(expanded, pushed, stale_pops, peak_frontier, visited):
+    return {'expanded': expanded, 'pushed': pushed, 'stale_pops': stale_pops,
+            'peak_frontier': peak_frontier, 'visited': visited}
+
+
+def reconstruct_path(environment, came_from, start, goal):
+    """Reconstruct the path of (x, y) locations from start to goal cell ids."""
+    current = goal
+    path = []
+    while current != start:
+        path.append(environment.cell_location(current))
+        current = came_from.get(current)
+    path.reverse()
+    return path
+
+
+@register("A*")
+def a_star(environment, start, goals, hooks=None):
+    """A* towards the goal nearest to start by Manhattan distance."""
+    hooks = hooks or NO_HOOKS
+    on_push, on_pop, on_expand = hooks.on_push, hooks.on_pop, hooks.on_expand
+    neighbors = environment.neighbors
+    rows = environment.padded_rows
+    start = environment.cell_id(*start)
+    goal = environment.cell_id(*nearest_goal(environment.cell_location(start), goals))
+    goal_x, goal_y = divmod(goal, rows)
+
+    frontier = [(0, start)]  # Priority queue: (priority, cell id)
+    came_from = {start: None}
+    cost_so_far = {start: 0}
+    closed = set()
+    expanded = stale_pops = 0
+    pushed = peak_frontier = 1
+    path = []
+
+    while frontier:
+        if len(frontier) > peak_frontier:
+            peak_frontier = len(frontier)
+        _, current = heapq.heappop(frontier)
+        if on_pop is not None:
+            on_pop(current)
+        if current == goal:
+            path = reconstruct_path(environment, came_from, start, current)
+            break
+        if current in closed:
+            stale_pops += 1  # Superseded by a cheaper entry that was already expanded
+            continue
+        closed.add(current)
+        expanded += 1
+        if on_expand is not None:
+            on_expand(current)
+
+        new_cost = cost_so_far[current] + 1
+        for next_node in neighbors[current]:
+            if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
+                cost_so_far[next_node] = new_cost
+                x, y = divmod(next_node, rows)
+                priority = new_cost + abs(x - goal_x) + abs(y - goal_y)  # Manhattan distance heuristic
+                heapq.heappush(frontier, (priority, next_node))
+                pushed += 1
+                if on_push is not None:
+                    on_push(next_node, priority)
+                came_from[next_node] = current
+
+    return path, search_stats(expanded, pushed, stale_pops, peak_frontier, len(came_from))
+
+
+@register("UCS")
+def ucs(environment, start, goals, hooks=None):
+    """Uniform Cost Search towards whichever goal is reached first."""
+    hooks = hooks or NO_HOOKS
+    on_push, on_pop, on_expand = hooks.on_push, hooks.on_pop, hooks.on_expand
+    neighbors = environment.neighbors
+    goal_cells = {environment.cell_id(*goal) for goal in goals}
+    start = environment.cell_id(*start)
+
+    frontier = [(0, start)]  # Priority queue: (cost, cell id)
+    came_from = {start: None}
+    expanded = 0
+    pushed = peak_frontier = 1
+    path = []
+
+    while frontier:
+        if len(frontier) > peak_frontier:
+            peak_frontier = len(frontier)
+        current_cost, current = heapq.heappop(frontier)
+        if on_pop is not None:
+            on_pop(current)
+        if current in goal_cells:
+            path = reconstruct_path(environment, came_from, start, current)
+            break
+        expanded += 1
+        if on_expand is not None:
+            on_expand(current)
+
+        # Cells are pushed at most once, so UCS never pops a stale entry
+        for next_node in neighbors[current]:  # Right, Down, Left, Up
+            if next_node not in came_from:
+                heapq.heappush(frontier, (current_cost + 1, next_node))
+                pushed += 1
+                if on_push is not None:
+                    on_push(next_node, current_cost + 1)
+                came_from[next_node] = current
+
+    return path, search_stats(expanded, pushed, 0, peak_frontier, len(came_from))
+
+
+@register("Bidirectional A*")
+def bidirectional_a_star(environment, start, goals, hooks=None):
+    """A* from both ends towards the goal nearest to start by Manhattan distance."""
+    hooks = hooks or NO_HOOKS
+    on_push, on_pop, on_expand = hooks.on_push, hooks.on_pop, hooks.on_expand
+    neighbors = environment.neighbors
+    rows = environment.padded_rows
+    start = environment.cell_id(*start)
+    goal = environment.cell_id(*nearest_goal(environment.cell_location(start), goals))
+    if start == goal:
+        return [], search_stats(0, 0, 0, 0, 1)
+
+    def heuristic(cell, target):
+        x, y = divmod(cell, rows)
+        target_x, target_y = divmod(target, rows)
+        return abs(x - target_x) + abs(y - target_y)
+
+    # Index 0 searches forward from start, index 1 backward from goal
+    targets = (goal, start)
+    frontiers = ([(heuristic(start, goal), start)], [(heuristic(goal, start), goal)])
+    costs = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    closed = (set(), set())
+    best_cost = float('inf')
+    meeting = None
+    expanded = stale_pops = 0
+    pushed = peak_frontier = 2
+
+    while frontiers[0] and frontiers[1]:
+        # Neither side can improve on the best meeting found so far
+        if frontiers[0][0][0] >= best_cost or frontiers[1][0][0] >= best_cost:
+            break
+
+        if len(frontiers[0]) + len(frontiers[1]) > peak_frontier:
+            peak_frontier = len(frontiers[0]) + len(frontiers[1])
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        _, current = heapq.heappop(frontiers[side])
+        if on_pop is not None:
+            on_pop(current)
+        if current in closed[side]:
+            stale_pops += 1  # Superseded by a cheaper entry that was already expanded
+            continue
+        closed[side].add(current)
+        expanded += 1
+        if on_expand is not None:
+            on_expand(current)
+
+        cost, other_cost = costs[side], costs[1 - side]
+        new_cost = cost[current] + 1
+        for next_node in neighbors[current]:
+            if next_node not in cost or new_cost < cost[next_node]:
+                cost[next_node] = new_cost
+                parents[side][next_node] = current
+                priority = new_cost + heuristic(next_node, targets[side])
+                heapq.heappush(frontiers[side], (priority, next_node))
+                pushed += 1
+                if on_push is not None:
+                    on_push(next_node, priority)
+                if next_node in other_cost and new_cost + other_cost[next_node] < best_cost:
+                    best_cost = new_cost + other_cost[next_node]
+                    meeting = next_node
+
+    stats = search_stats(expanded, pushed, stale_pops, peak_frontier, len(parents[0]) + len(parents[1]))
+    if meeting is None:
+        return [], stats
+
+    path = reconstruct_path(environment, parents[0], start, meeting)
+    current = parents[1][meeting]
+    while current is not None:
+        path.append(environment.cell_location(current))
+        current = parents[1][current]
+    return path, stats
+
+
+def _jump(tables, occupancy, rows, cell, step, goal):
+    """Walk from cell in direction step and return the next jump point, or None.
+
+    Horizontal steps are +/-rows and vertical steps +/-1 in padded cell ids.
+    The walk ends where environment.jump_tables says it stops, unless it
+    passes the goal first: a horizontal walk on the goal itself, a vertical
+    one in the goal's row if a horizontal walk from there reaches the goal.
+    """
+    stop = tables[step][cell]
+    if step == rows or step == -rows:
+        if goal % rows == cell % rows and (goal - cell) * step >= 0 and (stop - goal) * step > 0:
+            return goal
+    else:
+        crossing = cell - cell % rows + goal % rows  # Where this column meets the goal's row
+        if ((crossing - cell) * step >= 0 and (stop - crossing) * step > 0
+                and (crossing == goal
+                     or _jump(tables, occupancy, rows, crossing + rows, rows, goal) == goal
+                     or _jump(tables, occupancy, rows, crossing - rows, -rows, goal) == goal)):
+            return crossing
+    return None if occupancy[stop] else stop
+
+
+@register("JPS")
+def jump_point_search(environment, start, goals, hooks=None):
+    """Jump Point Search for 4-connected grids towards the Manhattan-nearest goal.
+
+    Each jump is one lookup in environment.jump_tables; visited counts the
+    cells the jumps ran over, as a cell-by-cell walk would have visited.
+    """
+    hooks = hooks or NO_HOOKS
+    on_push, on_pop, on_expand = hooks.on_push, hooks.on_pop, hooks.on_expand
+    occupancy = environment.occupancy
+    tables = environment.jump_tables
+    rows = environment.padded_rows
+    start = environment.cell_id(*start)
+    goal = environment.cell_id(*nearest_goal(environment.cell_location(start), goals))
+    goal_x, goal_y = divmod(goal, rows)
+
+    def heuristic(cell):
+        x, y = divmod(cell, rows)
+        return abs(x - goal_x) + abs(y - goal_y)
+
+    frontier = [(heuristic(start), start)]
+    cost_so_far = {start: 0}
+    came_from = {start: None}
+    closed = set()
+    expanded = stale_pops = scanned = 0
+    pushed = peak_frontier = 1
+    found = False
+
+    while frontier:
+        if len(frontier) > peak_frontier:
+            peak_frontier = len(frontier)
+        _, current = heapq.heappop(frontier)
+        if on_pop is not None:
+            on_pop(current)
+        if current == goal:
+            found = True
+            break
+        if current in closed:
+            stale_pops += 1  # Superseded by a cheaper entry that was already expanded
+            continue
+        closed.add(current)
+        expanded += 1
+        if on_expand is not None:
+            on_expand(current)
+
+        parent = came_from[current]
+        if parent is None:
+            steps = (1, rows, -1, -rows)
+        elif abs(current - parent) < rows:
+            # Arrived vertically: keep going and try both horizontal turns
+            step = 1 if current > parent else -1
+            steps = (step, rows, -rows)
+        else:
+            step = rows if current > parent else -rows
+            steps = (step, 1, -1)
+
+        for step in steps:
+            jump_point = _jump(tables, occupancy, rows, current + step, step, goal)
+            if jump_point is None:
+                scanned += abs(tables[step][current + step] - current) // abs(step)
+                continue
+            distance = abs(jump_point - current)
+            distance = distance // rows if distance >= rows else distance
+            scanned += distance
+            new_cost = cost_so_far[current] + distance
+            if jump_point not in cost_so_far or new_cost < cost_so_far[jump_point]:
+                cost_so_far[jump_point] = new_cost
+                came_from[jump_point] = current
+                priority = new_cost + heuristic(jump_point)
+                heapq.heappush(frontier, (priority, jump_point))
+                pushed += 1
+                if on_push is not None:
+                    on_push(jump_point, priority)
+
+    # Count every cell the jumps ran over, not just the jump points
+    stats = search_stats(expanded, pushed, stale_pops, peak_frontier, scanned + 1)
+    if not found:
+        return [], stats
+
+    # Fill in the straight runs between consecutive jump points
+    path = []
+    current = goal
+    while came_from[current] is not None:
+        parent = came_from[current]
+        if abs(current - parent) < rows:
+            step = 1 if current > parent else -1
+        else:
+            step = rows if current > parent else -rows
+        while current != parent:
+            path.append(environment.cell_location(current))
+            current -= step
+    path.reverse()
+    return path, stats
+
+
+@register("Distance Field")
+def distance_field(environment, start, goals, hooks=None):
+    """Nearest reachable task from the shared multi-source distance field.
+
+    The field is built from environment.task_locations and repaired as tasks
+    are completed, so `goals` must be the current task locations. Queries
+    walk stored pointers rather than searching, so hooks are never called.
+    """
+    planner = environment.planners.get("Distance Field")
+    if planner is None:
+        planner = environment.planners["Distance Field"] = TaskPlanner(environment)
+    path = planner.path_to_nearest(start)
+    return path, search_stats(0, 0, 0, 0, len(path))
+
+
+@register("D* Lite")
+def d_star_lite(environment, start, goals, hooks=None):
+    """Incremental A* towards the goal nearest to start by Manhattan distance.
+
+    The planner keeps its search between calls for as long as the goal stays
+    the same and repairs it after Environment.update_barriers(), so a replan
+    after the agent moved or barriers changed only searches what changed.
+    Assigning a new barrier_locations set starts a fresh planner. Hooks are
+    not called; stats count the work since the previous call.
+    """
+    goal = nearest_goal(start, goals)
+    planner = environment.planners.get("D* Lite")
+    if (planner is None or planner.goal != environment.cell_id(*goal)
+            or planner.occupancy is not environment.occupancy):
+        if planner is not None:
+            planner.close()
+        planner = environment.planners["D* Lite"] = DStarLite(environment, start, goal)
+    else:
+        planner.move_to(start)
+    path = planner.plan()
+    return path, planner.last_stats
+
+
+@register("Tour")
+def tour(environment, start, goals, hooks=None):
+    """One path through every reachable goal, in the shortest order found.
+
+    tour.py builds the grid distances between start and the goals in one
+    bit-parallel BFS and orders the goals exactly (Held-Karp) or with 2-opt
+    and Or-opt for larger tours. The legs are then stitched together with
+    A*, whose paths are as short as the BFS distances. The BFS runs on whole
+    arrays, so only the A* legs report to hooks; stats cover both.
+    """
+    order, stats = tour_order(environment, start, goals)
+    path = []
+    for goal in order:
+        leg, leg_stats = a_star(environment, path[-1] if path else start, [goal], hooks)
+        path += leg
+        for field in STAT_FIELDS:
+            stats[field] = max(stats[field], leg_stats[field]) if field == 'peak_frontier' else stats[field] + leg_stats[field]
+    return path, stats
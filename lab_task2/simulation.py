@@ -0,0 +1,165 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from environment import Environment
+from eventlog import EventWriter
+from planner import TaskPlanner
+from replay import log_environment
+
+
+class Simulation:
+    """Headless engine advancing many agents over one shared Environment.
+
+    Agent state is kept as parallel NumPy arrays (struct of arrays). Idle
+    agents claim the nearest unclaimed reachable task one at a time, so no
+    two agents ever hold the same task, and read their path straight off a
+    single distance field over the unclaimed tasks instead of searching.
+    Active paths sit back to back in one cell-id buffer, so a tick moves
+    every agent one cell with a single gather. Agents may share cells.
+    Moves and task completions are written to `log` (an EventWriter) if given.
+    """
+
+    def __init__(self, environment, num_agents, starts=None, log=None):
+        self.environment = environment
+        self.num_agents = num_agents
+        if starts is None:
+            starts = [(0, 0)] * num_agents  # Same starting corner as the interactive agent
+        self.cells = np.array([environment.cell_id(*start) for start in starts], dtype=np.int64)
+        self.targets = np.full(num_agents, -1, dtype=np.int64)  # Claimed task cell, -1 when idle
+        self.cursor = np.zeros(num_agents, dtype=np.int64)      # Index of the next cell in self.paths
+        self.path_end = np.zeros(num_agents, dtype=np.int64)    # Index just past the agent's path
+        self.path_cost = np.zeros(num_agents, dtype=np.int64)
+        self.tasks_completed = np.zeros(num_agents, dtype=np.int64)
+
+        self.paths = np.empty(1024, dtype=np.int64)
+        self.paths_used = 0
+        self.unclaimed = dict(environment.task_locations)
+        self.planner = TaskPlanner(environment, self.unclaimed)
+        self.tick = 0
+        self.completed = []  # (tick, agent, task number) per completed task
+        self.log = log
+        if log:
+            log_environment(log, environment, starts, "Distance Field")
+
+    def positions(self):
+        """(x, y) of every agent as two arrays."""
+        x, y = np.divmod(self.cells, self.environment.padded_rows)
+        return x - 1, y - 1
+
+    def claim_tasks(self):
+        """Give every idle agent the nearest unclaimed task it can reach."""
+        for agent in np.flatnonzero(self.targets < 0):
+            if not self.unclaimed:
+                break
+            path = self.planner.cell_path_to_nearest(int(self.cells[agent]), sync=False)
+            if path is None:
+                continue  # Nothing reachable from here
+            target = path[-1] if path else int(self.cells[agent])
+            location = self.environment.cell_location(target)
+            del self.unclaimed[location]
+            self.planner.remove_task(location)
+            self.targets[agent] = target
+            if path:
+                self.store_path(agent, path)
+            else:
+                self.complete([agent])  # Already standing on it
+
+    def store_path(self, agent, path):
+        if self.paths_used + len(path) > len(self.paths):
+            self.compact(len(path))
+        start = self.paths_used
+        self.paths[start:start + len(path)] = path
+        self.cursor[agent] = start
+        self.path_end[agent] = start + len(path)
+        self.paths_used += len(path)
+
+    def compact(self, extra):
+        """Drop walked path cells, growing the buffer if it is still too small."""
+        active = np.flatnonzero(self.cursor < self.path_end)
+        remaining = self.path_end[active] - self.cursor[active]
+        capacity = max(len(self.paths), 2 * (int(remaining.sum()) + extra))
+        paths = np.empty(capacity, dtype=np.int64)
+        position = 0
+        for agent, length in zip(active, remaining):
+            paths[position:position + length] = self.paths[self.cursor[agent]:self.path_end[agent]]
+            self.cursor[agent] = position
+            self.path_end[agent] = position + length
+            position += length
+        idle = self.cursor >= self.path_end
+        self.cursor[idle] = 0
+        self.path_end[idle] = 0
+        self.paths = paths
+        self.paths_used = position
+
+    def complete(self, agents):
+        for agent in agents:
+            location = self.environment.cell_location(int(self.targets[agent]))
+            task_number = self.environment.task_locations.pop(location, None)
+            self.tasks_completed[agent] += 1
+            self.completed.append((self.tick, int(agent), task_number))
+            if self.log:
+                self.log.write('task', tick=self.tick, agent=int(agent), task=task_number,
+                               x=location[0], y=location[1])
+            self.targets[agent] = -1
+
+    def step(self):
+        """Advance every agent by one cell and return how many moved."""
+        self.claim_tasks()
+        moving = np.flatnonzero(self.cursor < self.path_end)
+        if moving.size:
+            self.cells[moving] = self.paths[self.cursor[moving]]
+            self.cursor[moving] += 1
+            self.path_cost[moving] += 1
+            if self.log:
+                x, y = np.divmod(self.cells[moving], self.environment.padded_rows)
+                self.log.write('moves', tick=self.tick, agents=moving, x=x - 1, y=y - 1)
+            self.complete(moving[self.cursor[moving] == self.path_end[moving]])
+        self.tick += 1
+        return moving.size
+
+    def run(self, max_ticks=None):
+        """Step until every reachable task is done (or max_ticks) and return the ticks run."""
+        start_tick = self.tick
+        while max_ticks is None or self.tick - start_tick < max_ticks:
+            moved = self.step()
+            if moved == 0 and not (self.targets >= 0).any():
+                break  # No agent has a task left to walk to
+        return self.tick - start_tick
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many agents headlessly on one grid.")
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--size", type=int, default=100, help="grid columns and rows")
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--barriers", type=float, default=0.1, help="fraction of cells that are barriers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log", help="write an event log of the run here (replay it with replay.py)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    environment = Environment(args.size, args.size, 1, num_tasks=args.tasks,
+                              num_barriers=int(args.barriers * args.size * args.size), seed=args.seed)
+    free = [(x, y) for x in range(environment.columns) for y in range(environment.rows)
+            if not environment.is_barrier(x, y)]
+    log = EventWriter(args.log) if args.log else None
+    simulation = Simulation(environment, args.agents, [random.choice(free) for _ in range(args.agents)], log)
+
+    start = time.perf_counter()
+    ticks = simulation.run()
+    elapsed = time.perf_counter() - start
+    if log:
+        log.close()
+
+    print(f"Ticks: {ticks}")
+    print(f"Tasks Completed: {int(simulation.tasks_completed.sum())} of {args.tasks}")
+    print(f"Total Path Cost: {int(simulation.path_cost.sum())}")
+    print(f"Ticks/sec: {ticks / elapsed:.0f}")
+    print(f"Agent steps/sec: {int(simulation.path_cost.sum()) / elapsed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
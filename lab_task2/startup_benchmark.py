@@ -0,0 +1,53 @@
+# Canonical copy: lab_task3/startup_benchmark.py shares everything but WORKER and
+# CASES, which are specific to each lab. Fix the rest here first, then copy it over.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# A short-lived batch worker: build a grid, plan the agent's first path and report whether pygame was loaded
+WORKER = """
+import sys
+from agent import Agent
+from environment import Environment
+Agent(Environment(800, 600, 40, num_tasks=5, num_barriers=15, seed=0), 40).plan()
+print('pygame' in sys.modules)
+"""
+
+# The same worker paying for pygame and the agent's Surface, as the Sprite-based Agent used to
+CASES = {'headless': WORKER,
+         'with pygame': "import pygame\npygame.Surface((40, 40)).fill((0, 0, 255))\n" + WORKER}
+
+
+def time_case(code, runs):
+    """Wall times of `runs` fresh interpreters running code, and whether pygame was loaded."""
+    environment = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    directory = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], cwd=directory, env=environment,
+                                capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+    return times, result.stdout.strip() == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the startup of a batch worker with and without pygame.")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters started per case")
+    args = parser.parse_args()
+
+    medians = {}
+    for name, code in CASES.items():
+        times, loaded = time_case(code, args.runs)
+        medians[name] = statistics.median(times)
+        print(f"{name:>12}: median {medians[name] * 1000:7.1f} ms, min {min(times) * 1000:7.1f} ms, "
+              f"pygame loaded: {loaded}")
+    saving = medians['with pygame'] - medians['headless']
+    print(f"Saving per worker: {saving * 1000:.1f} ms ({saving / medians['with pygame']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
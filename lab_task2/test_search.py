@@ -0,0 +1,110 @@
+import random
+from collections import deque
+
+import pytest
+
+from environment import Environment
+from search import SEARCHES, release_planners
+
+# Strategies that find a shortest path to the one goal they are given
+SINGLE_GOAL = ["A*", "UCS", "Bidirectional A*", "JPS", "D* Lite"]
+
+
+def bfs_distances(environment, start):
+    """Grid distance from start to every reachable free location, by plain BFS."""
+    distances = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        x, y = frontier.popleft()
+        for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            location = (x + dx, y + dy)
+            if (environment.is_within_bounds(*location) and location not in distances
+                    and not environment.is_barrier(*location)):
+                distances[location] = distances[(x, y)] + 1
+                frontier.append(location)
+    return distances
+
+
+def random_environment(seed):
+    rng = random.Random(seed)
+    columns, rows = rng.randint(1, 20), rng.randint(1, 20)
+    environment = Environment(columns, rows, 1, rng.randint(1, 5),
+                              rng.randint(0, columns * rows * 2 // 5), seed=seed)
+    return environment, rng
+
+
+def free_location(environment, rng):
+    free = [(x, y) for x in range(environment.columns) for y in range(environment.rows)
+            if not environment.is_barrier(x, y)]
+    return rng.choice(free) if free else None
+
+
+def check_path(environment, start, path, goals, distance):
+    """path is a shortest walk over free cells from start to one of goals (empty if none is reachable)."""
+    if distance is None:
+        assert path == []
+        return
+    assert len(path) == distance
+    current = start
+    for location in path:
+        assert abs(location[0] - current[0]) + abs(location[1] - current[1]) == 1
+        assert environment.is_within_bounds(*location) and not environment.is_barrier(*location)
+        current = location
+    assert current in goals or (not path and start in goals)
+
+
+@pytest.mark.parametrize('algorithm', SINGLE_GOAL)
+@pytest.mark.parametrize('seed', range(30))
+def test_single_goal_searches_match_bfs(algorithm, seed):
+    environment, rng = random_environment(seed)
+    for _ in range(5):
+        start, goal = free_location(environment, rng), free_location(environment, rng)
+        if start is None:
+            return
+        path, stats = SEARCHES[algorithm](environment, start, [goal])
+        check_path(environment, start, path, [goal], bfs_distances(environment, start).get(goal))
+        assert set(stats) == {'expanded', 'pushed', 'stale_pops', 'peak_frontier', 'visited'}
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_distance_field_matches_bfs(seed):
+    environment, rng = random_environment(seed)
+    start = free_location(environment, rng)
+    while start is not None and environment.task_locations:
+        goals = list(environment.task_locations)
+        distances = bfs_distances(environment, start)
+        reachable = [distances[goal] for goal in goals if goal in distances]
+        path, _ = SEARCHES["Distance Field"](environment, start, goals)
+        check_path(environment, start, path, goals, min(reachable) if reachable else None)
+        if not path:
+            break
+        environment.task_locations.pop(path[-1])
+        start = path[-1]
+
+
+@pytest.mark.parametrize('algorithm', ["D* Lite", "Distance Field"])
+@pytest.mark.parametrize('seed', range(30))
+def test_repaired_searches_match_bfs_after_barrier_changes(algorithm, seed):
+    environment, rng = random_environment(seed)
+    start = free_location(environment, rng)
+    if start is None:
+        return
+    goals = list(environment.task_locations)
+    for _ in range(10):
+        cells = [(x, y) for x in range(environment.columns) for y in range(environment.rows)]
+        # Like run.py's --dynamic-barriers, never block the agent or a task
+        added = [location for location in rng.sample(cells, min(len(cells), 3))
+                 if location != start and location not in environment.task_locations]
+        removed = rng.sample(sorted(environment.barrier_locations), min(len(environment.barrier_locations), 3))
+        environment.update_barriers(added, removed)
+
+        distances = bfs_distances(environment, start)
+        if algorithm == "D* Lite":
+            goals = goals[:1]  # D* Lite heads for the Manhattan-nearest goal only
+        reachable = [distances[goal] for goal in goals if goal in distances]
+        path, _ = SEARCHES[algorithm](environment, start, goals)
+        check_path(environment, start, path, goals, min(reachable) if reachable else None)
+        if path:
+            start = path[min(len(path), 2) - 1]  # Move on a little, as the agent does between replans
+    release_planners(environment)
+    assert not environment.barrier_listeners
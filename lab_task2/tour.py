@@ -0,0 +1,248 @@
+import itertools
+
+import numpy as np
+
+HELD_KARP_LIMIT = 12  # Largest task count ordered exactly; larger tours use 2-opt and Or-opt
+NEAREST_NODES = 8     # Or-opt only moves a run next to this many of its ends' nearest nodes
+
+
+def distance_matrix(environment, sources, targets):
+    """Grid distances from every source cell id to every target cell id, all in one BFS.
+
+    Each source owns one bit of a per-cell bitset, so a single level of the
+    search advances every source's frontier with a few whole-grid NumPy
+    shifts. A source's frontier is dropped once it has reached every
+    target. Returns a (sources, targets) array with -1 for unreachable
+    pairs, and the search counters.
+    """
+    occupancy = np.frombuffer(bytes(environment.occupancy), dtype=np.uint8)
+    words = (len(sources) + 63) // 64
+    targets = np.asarray(targets, dtype=np.int64)
+    index = np.arange(len(sources))
+    bits = np.zeros((len(sources), words), dtype=np.uint64)  # Each source's own bit
+    bits[index, index // 64] = np.uint64(1) << (index % 64).astype(np.uint64)
+
+    # Bit i of unseen[cell] stays set until source i reaches the (free) cell
+    free = np.where(occupancy == 0, ~np.uint64(0), np.uint64(0))[:, None].repeat(words, axis=1)
+    unseen = free.copy()
+    frontier = np.zeros_like(unseen)
+    np.bitwise_or.at(frontier, np.asarray(sources, dtype=np.int64), bits)
+    unseen &= ~frontier
+    complete = np.bitwise_or.reduce(bits, axis=0)
+    spread = np.empty_like(frontier)
+
+    distances = np.full((len(sources), len(targets)), -1, dtype=np.int64)
+    offsets = environment.neighbor_offsets
+    distance = 0
+    expanded = peak_frontier = 0
+    while True:
+        reached = frontier[targets]
+        if reached.any():
+            arrived = np.unpackbits(reached.view(np.uint8), axis=1, bitorder='little')[:, :len(sources)]
+            distances[arrived.T.astype(bool)] = distance
+        # Sources that have reached every target stop spreading
+        pending = np.bitwise_or.reduce(unseen[targets] & complete, axis=0)
+        if not pending.any():
+            break  # Every source has reached every target
+        frontier &= pending
+        active = np.count_nonzero(frontier.any(axis=1)) if words > 1 else np.count_nonzero(frontier)
+        if active == 0:
+            break  # The remaining pairs are unreachable
+        expanded += int(active)
+        peak_frontier = max(peak_frontier, int(active))
+
+        # Cells next to the frontier, per source, that the source has not reached yet
+        spread.fill(0)
+        for offset in offsets:
+            if offset > 0:
+                spread[offset:] |= frontier[:-offset]
+            else:
+                spread[:offset] |= frontier[-offset:]
+        frontier, spread = spread, frontier
+        frontier &= unseen
+        unseen ^= frontier
+        distance += 1
+
+    visited = int(np.count_nonzero((unseen != free).any(axis=1)))
+    return distances, {'expanded': expanded, 'pushed': visited, 'stale_pops': 0,
+                       'peak_frontier': peak_frontier, 'visited': visited}
+
+
+def tour_length(order, dist):
+    return sum(dist[a][b] for a, b in zip(order, order[1:]))
+
+
+def held_karp(dist):
+    """Shortest open tour from node 0 through every other node, by dynamic programming over subsets.
+
+    Subsets are handled a size at a time, so each (size, last node) step
+    is one NumPy operation over every subset of that size.
+    """
+    n = len(dist) - 1
+    if n == 0:
+        return [0]
+    dist = np.asarray(dist, dtype=np.int64)
+    legs = dist[1:, 1:]
+    full = (1 << n) - 1
+    masks = np.arange(full + 1)
+    sizes = np.zeros(full + 1, dtype=np.int64)
+    for node in range(n):
+        sizes += (masks >> node) & 1
+    # cost[mask, last]: shortest path from 0 through the nodes in mask, ending at node last + 1
+    unreached = np.iinfo(np.int64).max // 4
+    cost = np.full((full + 1, n), unreached, dtype=np.int64)
+    parent = np.full((full + 1, n), -1, dtype=np.int64)
+    cost[1 << np.arange(n), np.arange(n)] = dist[0, 1:]
+    for size in range(2, n + 1):
+        layer = masks[sizes == size]
+        for last in range(n):
+            ending = layer[(layer >> last) & 1 == 1]
+            candidates = cost[ending ^ (1 << last)] + legs[:, last]
+            before = np.argmin(candidates, axis=1)
+            cost[ending, last] = candidates[np.arange(len(ending)), before]
+            parent[ending, last] = before
+
+    last = int(np.argmin(cost[full]))
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last + 1)
+        mask, last = mask & ~(1 << last), int(parent[mask, last])
+    order.append(0)
+    order.reverse()
+    return order
+
+
+def nearest_neighbor(dist):
+    """Open tour from node 0 that always moves on to the nearest unvisited node."""
+    order = [0]
+    unvisited = set(range(1, len(dist)))
+    while unvisited:
+        current = dist[order[-1]]
+        following = min(unvisited, key=lambda node: (current[node], node))
+        unvisited.remove(following)
+        order.append(following)
+    return order
+
+
+def two_opt(order, dist):
+    """Reverse tour segments while that shortens the tour; node 0 stays first. Returns True if improved."""
+    improved = False
+    size = len(order)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(1, size - 1):
+            a, b = order[i - 1], order[i]
+            for j in range(i + 1, size):
+                c = order[j]
+                delta = dist[a][c] - dist[a][b]
+                if j + 1 < size:
+                    e = order[j + 1]
+                    delta += dist[b][e] - dist[c][e]
+                if delta < 0:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    b = order[i]
+                    changed = improved = True
+    return improved
+
+
+def nearest_nodes(dist, count=NEAREST_NODES):
+    """The `count` nodes nearest to each node, nearest first."""
+    return [sorted((other for other in range(len(row)) if other != node), key=row.__getitem__)[:count]
+            for node, row in enumerate(dist)]
+
+
+def or_opt(order, dist, near=None):
+    """Move runs of 1-3 nodes (possibly reversed) elsewhere while that shortens the tour. Returns True if improved.
+
+    A run is only tried next to the nodes in `near` of its ends (see
+    nearest_nodes()), or everywhere if `near` is None.
+    """
+    improved = False
+    changed = True
+    while changed:
+        changed = False
+        for length in (1, 2, 3):
+            i = 1
+            while i + length <= len(order):
+                size = len(order)
+                end = i + length  # First position after the run
+                first, last = order[i], order[end - 1]
+                before = order[i - 1]
+                after = order[end] if end < size else None
+                removed = dist[before][first] + (dist[last][after] - dist[before][after] if after is not None else 0)
+
+                # Insert between order[p] and order[p + 1] for an edge away from the run, or at the end
+                if near is None:
+                    candidates = itertools.chain(range(i - 1), range(end, size))
+                else:
+                    position = {node: p for p, node in enumerate(order)}
+                    candidates = set()
+                    for node in itertools.chain(near[first], near[last]):
+                        p = position[node]
+                        candidates.update((p, p - 1))
+                    candidates = [p for p in candidates if 0 <= p < i - 1 or end <= p < size]
+                best = None
+                for p in candidates:
+                    x = order[p]
+                    y = order[p + 1] if p + 1 < size else None
+                    for head, tail in ((first, last), (last, first)):
+                        added = dist[x][head] + (dist[tail][y] - dist[x][y] if y is not None else 0)
+                        if added < removed and (best is None or added < best[0]):
+                            best = (added, p, head == last)
+                if best is not None:
+                    _, p, reverse = best
+                    run = order[i:end][::-1] if reverse else order[i:end]
+                    if p < i:
+                        order[:] = order[:p + 1] + run + order[p + 1:i] + order[end:]
+                    else:
+                        order[:] = order[:i] + order[end:p + 1] + run + order[p + 1:]
+                    changed = improved = True
+                i += 1
+    return improved
+
+
+def order_tasks(dist):
+    """Visiting order of the nodes of a distance matrix, starting from node 0.
+
+    Exact (Held-Karp) up to HELD_KARP_LIMIT nodes after the start; larger
+    tours start from nearest neighbor and are improved with 2-opt and Or-opt
+    (moving runs next to their NEAREST_NODES nearest nodes) until neither
+    shortens them.
+    """
+    if len(dist) - 1 <= HELD_KARP_LIMIT:
+        return held_karp(dist)
+    order = nearest_neighbor(dist)
+    near = nearest_nodes(dist)
+    while two_opt(order, dist) | or_opt(order, dist, near):
+        pass
+    return order
+
+
+def tour_order(environment, start, goals):
+    """Goals in the order of the shortest tour found from start, and the BFS counters.
+
+    Builds the grid distance matrix between start and the goals with
+    distance_matrix() and orders the goals with order_tasks(). Unreachable
+    goals are left out.
+    """
+    goal_cells = list(dict.fromkeys(environment.cell_id(*goal) for goal in goals))
+    if not goal_cells:
+        return [], {'expanded': 0, 'pushed': 0, 'stale_pops': 0, 'peak_frontier': 0, 'visited': 0}
+    sources = [environment.cell_id(*start)] + goal_cells
+    distances, stats = distance_matrix(environment, sources, goal_cells)
+
+    reachable = np.flatnonzero(distances[0] >= 0)
+    if reachable.size == 0:
+        return [], stats
+    # A start on a barrier cell can reach goals that cannot reach each
+    # other, so only the goals connected to the nearest one are toured
+    nearest = reachable[np.argmin(distances[0, reachable])]
+    nodes = np.flatnonzero(distances[nearest + 1] >= 0)
+    dist = np.zeros((nodes.size + 1, nodes.size + 1), dtype=np.int64)
+    dist[0, 1:] = distances[0, nodes]
+    dist[1:, 1:] = distances[nodes + 1][:, nodes]
+
+    order = order_tasks(dist.tolist())
+    return [environment.cell_location(goal_cells[nodes[node - 1]]) for node in order[1:]], stats
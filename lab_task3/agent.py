@@ -1,19 +1,30 @@
 # agent.py
+import numpy as np
+
+
 class Student:
-    def __init__(self, id, availability, preferences):
+    """A student's row of the environment's availability and preference tables.
+
+    `available` is a boolean mask over the time slots and `preference` the
+    matching float32 row (0 where unavailable), so lookups are plain indexing
+    whatever integer type the slot is. `availability` lists the available slots.
+    """
+
+    def __init__(self, id, available, preference):
         self.id = id
-        self.availability = availability
-        self.preferences = preferences
+        self.available = available
+        self.preference = preference
+        self.availability = np.flatnonzero(available)
         self.schedule = []
 
     def can_attend(self, time_slot):
-        return time_slot in self.availability
+        return bool(self.available[time_slot])
 
     def get_preference(self, time_slot):
-        return self.preferences.get(time_slot, 0)
+        return float(self.preference[time_slot])
 
     def assign_class(self, class_time):
         self.schedule.append(class_time)
 
     def reset_schedule(self):
-        self.schedule = []
\ No newline at end of file
+        self.schedule = []
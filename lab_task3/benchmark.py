@@ -0,0 +1,89 @@
+# benchmark.py
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from delta_fitness import DeltaEvaluator
+from environment import Environment
+from fitness_engine import FitnessEngine
+from optimizer import GeneticOptimizer
+from solver import SOLVERS, solve
+
+FIELDS = ['solver', 'classes', 'students', 'slots', 'seed', 'fitness', 'raw_score', 'wall_time']
+
+
+def score(environment, schedule):
+    """Fitness of a schedule and its score before clamping at 0.
+
+    Overloaded instances clamp every schedule to 0, so solvers are compared
+    on the raw score.
+    """
+    scored = DeltaEvaluator(FitnessEngine(environment)).full(schedule.genes)
+    return scored.score, 100.0 + scored.placement_total - 30.0 * scored.overlap / 5.0
+
+
+def run_case(solver, environment, seed, budget, generations):
+    start = time.perf_counter()
+    if solver == 'ga':
+        with GeneticOptimizer(environment, rng=random.Random(seed),
+                              random_state=np.random.RandomState(seed)) as optimizer:
+            schedule = optimizer.run(generations)
+    else:
+        schedule = solve(environment, budget, solver, seed=seed)
+    wall_time = time.perf_counter() - start
+    fitness, raw_score = score(environment, schedule)
+    return {'fitness': fitness, 'raw_score': raw_score, 'wall_time': wall_time}
+
+
+def run_benchmark(solvers, sizes, slots, seeds, budget, generations):
+    rows = []
+    for num_classes, num_students in sizes:
+        for seed in range(seeds):
+            environment = Environment(num_classes, num_students, slots, seed=seed)
+            for solver in solvers:
+                row = {'solver': solver, 'classes': num_classes, 'students': num_students,
+                       'slots': slots, 'seed': seed}
+                row.update(run_case(solver, environment, seed, budget, generations))
+                rows.append(row)
+    return rows
+
+
+def size(text):
+    num_classes, num_students = text.split('x')
+    return int(num_classes), int(num_students)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the direct solvers with the GA on seeded problems.")
+    parser.add_argument("--solvers", nargs="+", default=['ga'] + list(SOLVERS), choices=['ga'] + list(SOLVERS))
+    parser.add_argument("--sizes", nargs="+", type=size, default=[(10, 5), (100, 20), (2000, 500)],
+                        help="problem sizes as CLASSESxSTUDENTS")
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeded problems per size")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds for the anneal solver")
+    parser.add_argument("--generations", type=int, default=100, help="generations the GA runs for")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solvers, args.sizes, args.slots, args.seeds, args.budget, args.generations)
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    if args.format == "json":
+        json.dump(rows, output, indent=2)
+        output.write("\n")
+    else:
+        writer = csv.DictWriter(output, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    if args.output:
+        output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# chromosome.py
+import numpy as np
+
+
+def gene_dtype(num_students, num_time_slots):
+    """Smallest integer dtype that can hold every slot and student index."""
+    return np.int16 if max(num_students, num_time_slots) <= np.iinfo(np.int16).max else np.int32
+
+
+class Chromosome:
+    """Compact schedule: row c of `genes` holds (time_slot, student) for class c.
+
+    `genes` is usually a row view into a (pop, classes, 2) population array,
+    so a whole generation lives in one contiguous block of small integers.
+    """
+
+    __slots__ = ('genes',)
+
+    def __init__(self, genes):
+        self.genes = genes
+
+    @classmethod
+    def from_schedule(cls, schedule, num_classes, dtype=np.int16):
+        """Adapter from the list-of-dicts schedule format."""
+        genes = np.zeros((num_classes, 2), dtype=dtype)
+        for assignment in schedule:
+            genes[assignment['class_id']] = (assignment['time_slot'], assignment['student'])
+        return cls(genes)
+
+    def to_schedule(self, class_order=None):
+        """Adapter to the list-of-dicts schedule format."""
+        if class_order is None:
+            class_order = range(len(self.genes))
+        return [{'class_id': class_id,
+                 'time_slot': int(self.genes[class_id, 0]),
+                 'student': int(self.genes[class_id, 1])}
+                for class_id in class_order]
+
+    def __len__(self):
+        return len(self.genes)
+
+    def copy(self):
+        return Chromosome(self.genes.copy())
+
+    def key(self):
+        return self.genes.tobytes()
+
+    def crossover(self, other, point, out=None):
+        """Write self[:point] + other[point:] into `out` (a new Chromosome if None)."""
+        if out is None:
+            out = Chromosome(np.empty_like(self.genes))
+        out.genes[:point] = self.genes[:point]
+        out.genes[point:] = other.genes[point:]
+        return out
+
+    def set_gene(self, class_id, time_slot, student):
+        self.genes[class_id, 0] = time_slot
+        self.genes[class_id, 1] = student
+
+
+def as_schedule(schedule):
+    """Return schedule in list-of-dicts form whichever format it is in."""
+    if isinstance(schedule, Chromosome):
+        return schedule.to_schedule()
+    return schedule
@@ -0,0 +1,208 @@
+# delta_fitness.py
+import numpy as np
+
+
+class ScoredSchedule:
+    """A (classes, 2) schedule array carried together with its score components.
+
+    `placement_total` is the summed preference/availability term of every
+    class and `overlap` the summed priority of every class penalised for
+    overlapping, as in FitnessEngine.overlap_weight(); both are None while
+    the schedule waits for DeltaEvaluator.flush().
+    How many classes of each priority a student has in an hour is
+    `root[student, hour, priority]`, except for the (student, hour) cells
+    listed in `changes`. Relatives share one root array, which is only
+    written to by the schedule that `owns_root`; root is None until
+    DeltaEvaluator.prepare() builds it.
+    """
+
+    __slots__ = ('genes', 'root', 'changes', 'owns_root', 'placement_total', 'overlap')
+
+    def __init__(self, genes, root=None, changes=None, owns_root=True, placement_total=None, overlap=None):
+        self.genes = genes
+        self.root = root
+        self.changes = {} if changes is None else changes
+        self.owns_root = owns_root
+        self.placement_total = placement_total
+        self.overlap = overlap
+
+    @property
+    def score(self):
+        return max(0.0, 100.0 + self.placement_total - 30.0 * self.overlap / 5.0)
+
+    @property
+    def counts(self):
+        """The (students, hours, 6) class counts as one array."""
+        counts = self.root.copy()
+        for (student, hour), cell in self.changes.items():
+            counts[student, hour] = cell
+        return counts
+
+    def copy(self):
+        return ScoredSchedule(self.genes.copy(), None if self.root is None else self.counts, None, True,
+                              self.placement_total, self.overlap)
+
+
+class DeltaEvaluator:
+    """Updates ScoredSchedule fitness in O(changed genes).
+
+    A crossover child starts from whichever parent gave it more genes and
+    shares that parent's counts, recording only the cells it changes; a
+    parent that has more than `max_changes` changed cells of its own first
+    folds them into a copy, so no child copies more than that. A child that
+    differs from its base parent in more than `max_delta_genes` genes is
+    instead queued and scored with every other queued child in one
+    FitnessEngine batch by flush(), since one vectorized pass is cheaper
+    than many scalar updates.
+    With `verify=True` every updated schedule is re-scored from scratch by the
+    FitnessEngine and an AssertionError is raised on any mismatch.
+    """
+
+    def __init__(self, engine, verify=False, max_delta_genes=None, max_changes=32):
+        self.engine = engine
+        self.verify = verify
+        if max_delta_genes is None:
+            # Measured break-even: a gene updated alone costs about as much as 128 scored in a batch
+            max_delta_genes = max(1, engine.num_classes // 128)
+        self.max_delta_genes = max_delta_genes
+        self.max_changes = max_changes
+        self.pending = []
+        self.checks = 0
+
+    def batch(self, population):
+        """ScoredSchedules for a (pop, classes, 2) array, scored in one pass; prepare() builds their counts."""
+        population = np.array(population, dtype=np.int64)
+        placement, overlap = self.engine.components(population)
+        return [ScoredSchedule(genes, placement_total=float(p), overlap=int(o))
+                for genes, p, o in zip(population, placement, overlap)]
+
+    def full(self, genes):
+        """Build a ScoredSchedule, counts included, by evaluating genes from scratch."""
+        individual = self.batch(np.asarray(genes)[None])[0]
+        self.prepare([individual])
+        return individual
+
+    def prepare(self, individuals):
+        """Build the counts of every schedule that has none yet, in one pass."""
+        missing = [individual for individual in individuals if individual.root is None]
+        if not missing:
+            return
+        engine = self.engine
+        genes = np.stack([individual.genes for individual in missing])
+        slots = genes[..., 0]
+        students = genes[..., 1] + np.arange(len(missing))[:, None] * engine.num_students
+        index = []
+        for offset in range(engine.max_duration):
+            covers = engine.duration > offset
+            index.append((((students[:, covers] * engine.span + slots[:, covers] + offset) * 6)
+                          + engine.priority[covers]).ravel())
+        size = engine.num_students * engine.span * 6
+        counts = np.bincount(np.concatenate(index), minlength=len(missing) * size).astype(np.int32)
+        counts = counts.reshape(len(missing), engine.num_students, engine.span, 6)
+        for individual, root in zip(missing, counts):
+            individual.root, individual.changes, individual.owns_root = root, {}, True
+
+    def flush(self):
+        """Score every child crossover() queued, in one FitnessEngine batch."""
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        placement, overlap = self.engine.components(np.stack([child.genes for child in pending]))
+        for child, p, o in zip(pending, placement, overlap):
+            child.placement_total = float(p)
+            child.overlap = int(o)
+            self._check(child)
+
+    def mutate(self, individual, class_id, time_slot, student):
+        """Reassign one class in place and update its score."""
+        self._set_gene(individual, class_id, time_slot, student)
+        self._check(individual)
+        return individual
+
+    def crossover(self, parent1, parent2, point):
+        """Return parent1[:point] + parent2[point:] as a new ScoredSchedule.
+
+        The child starts from whichever parent contributes more genes, and
+        only the genes that differ in the other parent's part are applied.
+        Children too far from that parent are scored by the next flush().
+        """
+        if point >= len(parent1.genes) - point:
+            base, donor, region = parent1, parent2, slice(point, None)
+        else:
+            base, donor, region = parent2, parent1, slice(0, point)
+
+        changed = np.flatnonzero((base.genes[region] != donor.genes[region]).any(axis=1))
+        if len(changed) > self.max_delta_genes:
+            child = ScoredSchedule(np.concatenate([parent1.genes[:point], parent2.genes[point:]]))
+            self.pending.append(child)
+            return child
+
+        if base.placement_total is None:
+            self.flush()
+        self.prepare([base])
+        if len(base.changes) > self.max_changes:
+            base.root, base.changes = base.counts, {}
+        base.owns_root = False  # The child reads the same root from now on
+        child = ScoredSchedule(base.genes.copy(), base.root, {cell: list(counts) for cell, counts in base.changes.items()},
+                               False, base.placement_total, base.overlap)
+        for class_id in changed + (region.start or 0):
+            time_slot, student = donor.genes[class_id]
+            self._set_gene(child, class_id, time_slot, student)
+        self._check(child)
+        return child
+
+    def _set_gene(self, individual, class_id, time_slot, student):
+        engine = self.engine
+        old_slot, old_student = individual.genes[class_id]
+        if old_slot == time_slot and old_student == student:
+            return
+        if individual.placement_total is None:
+            individual.genes[class_id] = (time_slot, student)  # Scored as a whole by flush()
+            return
+        if individual.root is None:
+            self.prepare([individual])
+
+        priority = int(engine.priority[class_id])
+        duration = int(engine.duration[class_id])
+
+        # A class only costs an overlap when it shares a cell with a class of
+        # equal or higher priority, so each cell changes by min(priority, cell max)
+        for hour in range(old_slot, old_slot + duration):
+            cell = self._cell(individual, old_student, hour)
+            cell[priority] -= 1
+            individual.overlap -= min(priority, self._max_priority(cell))
+        for hour in range(time_slot, time_slot + duration):
+            cell = self._cell(individual, student, hour)
+            individual.overlap += min(priority, self._max_priority(cell))
+            cell[priority] += 1
+
+        placement = engine.placement
+        individual.placement_total += engine.priority_weight[class_id] * (
+            placement[student, time_slot] - placement[old_student, old_slot])
+        individual.genes[class_id] = (time_slot, student)
+
+    @staticmethod
+    def _cell(individual, student, hour):
+        """The counts of one cell, writable without touching any other schedule."""
+        if individual.owns_root:
+            return individual.root[student, hour]
+        key = (int(student), hour)
+        cell = individual.changes.get(key)
+        if cell is None:
+            cell = individual.changes[key] = individual.root[student, hour].tolist()
+        return cell
+
+    @staticmethod
+    def _max_priority(cell):
+        for priority in range(5, 0, -1):
+            if cell[priority]:
+                return priority
+        return 0
+
+    def _check(self, individual):
+        if not self.verify or individual.placement_total is None:
+            return
+        self.checks += 1
+        expected = self.engine.evaluate(individual.genes[None])[0]
+        if not np.isclose(individual.score, expected):
+            raise AssertionError(f"Delta fitness {individual.score} != full fitness {expected}")
@@ -1,47 +1,89 @@
 # environment.py
-import pygame
 import numpy as np
 from agent import Student
+from chromosome import Chromosome, as_schedule, gene_dtype
 
 class Environment:
-    def __init__(self, num_classes, num_students=5, num_time_slots=8):
+    def __init__(self, num_classes, num_students=5, num_time_slots=8, seed=None):
         self.num_classes = num_classes
         self.num_students = num_students
         self.num_time_slots = num_time_slots
-        
-        # Initialize classes with priorities (1-5) and durations (1-2 hours)
-        self.classes = []
-        for i in range(num_classes):
-            priority = np.random.randint(1, 6)  # Priority from 1 to 5
-            duration = np.random.randint(1, 3)  # Duration 1 or 2 hours
-            self.classes.append({
-                'id': i,
-                'priority': priority,
-                'duration': duration
-            })
-        
-        # Initialize students with random preferences
-        self.students = []
-        for i in range(num_students):
-            # Generate random availability (70% chance of being available)
-            availability = np.where(np.random.random(num_time_slots) > 0.3)[0]
-            
-            # Generate random preferences between 0.5 and 2.0 for available slots
-            preferences = {}
-            for slot in availability:
-                preferences[slot] = np.random.uniform(0.5, 2.0)
-                
-            self.students.append(Student(i, availability, preferences))
-
-    def generate_assignments(self):
+        # A seed gives the environment its own generator; otherwise NumPy's global one is used
+        self.random_state = np.random.RandomState(seed) if seed is not None else None
+        rng = self.rng
+
+        # Class table: priorities (1-5) and durations (1-2 hours), indexed by class id
+        self.class_priority = rng.randint(1, 6, size=num_classes)
+        self.class_duration = rng.randint(1, 3, size=num_classes)
+
+        # Student x slot tables: 70% chance of being available, with a
+        # float32 preference between 0.5 and 2.0 for every available slot (0 otherwise)
+        self.availability = rng.random_sample((num_students, num_time_slots)) > 0.3
+        self.preference = np.where(self.availability,
+                                   rng.uniform(0.5, 2.0, (num_students, num_time_slots)), 0.0).astype(np.float32)
+        self._classes = None
+        self._students = None
+        self._average_preference = None
+        self._draw_cache = None
+
+    @property
+    def rng(self):
+        return self.random_state if self.random_state is not None else np.random
+
+    @property
+    def classes(self):
+        """Class dicts, built from the class table on first use."""
+        if self._classes is None:
+            self._classes = [{'id': i, 'priority': priority, 'duration': duration}
+                             for i, (priority, duration) in enumerate(zip(self.class_priority.tolist(),
+                                                                          self.class_duration.tolist()))]
+        return self._classes
+
+    @property
+    def students(self):
+        """Student objects, built from the student tables on first use."""
+        if self._students is None:
+            # Each student views its own row of the tables
+            self._students = [Student(i, available, preference)
+                              for i, (available, preference) in enumerate(zip(self.availability, self.preference))]
+        return self._students
+
+    def describe(self):
+        """Plain description of the classes and students, e.g. for an event log."""
+        return {
+            'num_time_slots': self.num_time_slots,
+            'classes': np.column_stack([self.class_priority, self.class_duration]).tolist(),
+            'students': [{'availability': np.flatnonzero(available).tolist(),
+                          'preferences': preference[available].tolist()}
+                         for available, preference in zip(self.availability, self.preference)],
+        }
+
+    @classmethod
+    def from_description(cls, description):
+        """Rebuild an environment from describe() output."""
+        environment = cls(0, 0, description['num_time_slots'], seed=0)
+        environment.num_classes = len(description['classes'])
+        environment.num_students = len(description['students'])
+        classes = np.array(description['classes'], dtype=int).reshape(-1, 2)
+        environment.class_priority = classes[:, 0]
+        environment.class_duration = classes[:, 1]
+        environment.availability = np.zeros((environment.num_students, environment.num_time_slots), dtype=bool)
+        environment.preference = np.zeros((environment.num_students, environment.num_time_slots), dtype=np.float32)
+        for i, student in enumerate(description['students']):
+            environment.availability[i, student['availability']] = True
+            environment.preference[i, student['availability']] = student['preferences']
+        return environment
+
+    def generate_assignments(self, population_size=50):
         population = []
-        for _ in range(50):  # Population size
+        rng = self.rng
+        for _ in range(population_size):
             schedule = []
             # Sort classes by priority (higher priority classes scheduled first)
             sorted_classes = sorted(self.classes, key=lambda x: x['priority'], reverse=True)
             for class_info in sorted_classes:
-                time_slot = np.random.randint(0, self.num_time_slots)
-                student = np.random.randint(0, self.num_students)
+                time_slot = rng.randint(0, self.num_time_slots)
+                student = rng.randint(0, self.num_students)
                 schedule.append({
                     'class_id': class_info['id'],
                     'time_slot': time_slot,
@@ -50,29 +92,90 @@ class Environment:
             population.append(schedule)
         return population
 
+    def generate_population(self, population_size=50, rng=None):
+        """Random population as a (pop, classes, 2) array of (time_slot, student) per class.
+
+        Drawn from `rng` (a np.random.RandomState) if given, else from the environment's generator.
+        """
+        rng = rng or self.rng
+        population = np.empty((population_size, self.num_classes, 2),
+                              dtype=gene_dtype(self.num_students, self.num_time_slots))
+        population[..., 0] = rng.randint(0, self.num_time_slots, size=(population_size, self.num_classes))
+        population[..., 1] = rng.randint(0, self.num_students, size=(population_size, self.num_classes))
+        return population
+
+    def average_preferences(self):
+        """Mean preference of each student over their available slots (0 with none)."""
+        if self._average_preference is None:
+            counts = self.availability.sum(axis=1)
+            self._average_preference = np.divide(self.preference.sum(axis=1), counts,
+                                                 out=np.zeros(self.num_students), where=counts > 0)
+        return self._average_preference
+
+    def assignment_index(self, schedule):
+        """Map (student, slot) to the ids of the classes assigned there, in schedule order."""
+        index = {}
+        for assignment in as_schedule(schedule):
+            index.setdefault((assignment['student'], assignment['time_slot']), []).append(assignment['class_id'])
+        return index
+
+    def render_text(self, font, text, color):
+        """Rendered text, cached across frames."""
+        key = (font, text, color)
+        surface = self._draw_cache['text'].get(key)
+        if surface is None:
+            surface = self._draw_cache['text'][key] = font.render(text, True, color)
+        return surface
+
+    def __getstate__(self):
+        # Rendered text cannot be pickled, e.g. when the environment is sent to worker processes
+        state = self.__dict__.copy()
+        state['_draw_cache'] = None
+        return state
+
     def draw_grid(self, screen, font, schedule):
+        """Draw the schedule as a student x slot grid.
+
+        The (student, slot) index of a schedule is built once and reused
+        while the same schedule is drawn again, and only rows and columns
+        that fit on the screen are drawn. pygame is only imported here, so
+        the environment itself works without it.
+        """
+        import pygame
+
+        if self._draw_cache is None:
+            self._draw_cache = {'key': None, 'index': None, 'text': {}}
+        # Unlike fitness_cache.schedule_key() this keeps the class ids, which
+        # decide the label drawn where several classes share a cell
+        if isinstance(schedule, Chromosome):
+            key = schedule.key()
+        else:
+            key = tuple((a['class_id'], a['time_slot'], a['student']) for a in schedule)
+        if key != self._draw_cache['key']:
+            self._draw_cache['key'] = key
+            self._draw_cache['index'] = self.assignment_index(schedule)
+        index = self._draw_cache['index']
+
         screen.fill((255, 255, 255))
         cell_width = 80
         cell_height = 60
         margin_left = 150
         margin_top = 100
+        visible_slots = min(self.num_time_slots, -(-(screen.get_width() - margin_left) // cell_width))
+        visible_students = min(self.num_students, -(-(screen.get_height() - margin_top) // cell_height))
 
         # Draw time slot headers
-        for slot in range(self.num_time_slots):
-            text = font.render(f"Slot {slot+1}", True, (0, 0, 0))
+        for slot in range(visible_slots):
+            text = self.render_text(font, f"Slot {slot+1}", (0, 0, 0))
             screen.blit(text, (margin_left + slot * cell_width + 10, margin_top - 30))
 
         # Draw student preferences and grid
-        for student in range(self.num_students):
-            # Calculate average preference
-            available_prefs = [self.students[student].get_preference(slot) 
-                             for slot in self.students[student].availability]
-            avg_pref = sum(available_prefs) / len(available_prefs) if available_prefs else 0
-            
-            pref_text = font.render(f"Preference: {avg_pref:.2f}", True, (0, 0, 0))
+        average_preferences = self.average_preferences()
+        for student in range(visible_students):
+            pref_text = self.render_text(font, f"Preference: {average_preferences[student]:.2f}", (0, 0, 0))
             screen.blit(pref_text, (10, margin_top + student * cell_height + cell_height // 3))
 
-            for slot in range(self.num_time_slots):
+            for slot in range(visible_slots):
                 cell_rect = pygame.Rect(
                     margin_left + slot * cell_width,
                     margin_top + student * cell_height,
@@ -82,24 +185,23 @@ class Environment:
 
                 # Default color
                 color = (200, 200, 200)  # Light gray for unassigned
-                
-                # Find class assignment for this slot and student
-                assigned_class = None
-                for assignment in schedule:
-                    if assignment['time_slot'] == slot and assignment['student'] == student:
-                        assigned_class = self.classes[assignment['class_id']]
-                        if slot in self.students[student].availability:
-                            # Blue if preferred (preference > 1.0), grey otherwise
-                            color = (0, 0, 255) if self.students[student].get_preference(slot) > 1.0 else (200, 200, 200)
-                        else:
-                            # Red if slot is unavailable
-                            color = (255, 0, 0)
-                        
-                        # Draw class information
-                        priority_text = font.render(f"P{assigned_class['priority']}", True, (255, 255, 255))
-                        duration_text = font.render(f"{assigned_class['duration']}h", True, (255, 255, 255))
-                        screen.blit(priority_text, (cell_rect.x + 5, cell_rect.y + 5))
-                        screen.blit(duration_text, (cell_rect.x + 5, cell_rect.y + 25))
 
+                assigned = index.get((student, slot))
+                if assigned:
+                    if self.availability[student, slot]:
+                        # Blue if preferred (preference > 1.0), grey otherwise
+                        color = (0, 0, 255) if self.preference[student, slot] > 1.0 else (200, 200, 200)
+                    else:
+                        # Red if slot is unavailable
+                        color = (255, 0, 0)
                 pygame.draw.rect(screen, color, cell_rect)
-                pygame.draw.rect(screen, (0, 0, 0), cell_rect, 1)
\ No newline at end of file
+
+                if assigned:
+                    # Draw class information for the last class assigned here
+                    class_id = assigned[-1]
+                    priority_text = self.render_text(font, f"P{self.class_priority[class_id]}", (255, 255, 255))
+                    duration_text = self.render_text(font, f"{self.class_duration[class_id]}h", (255, 255, 255))
+                    screen.blit(priority_text, (cell_rect.x + 5, cell_rect.y + 5))
+                    screen.blit(duration_text, (cell_rect.x + 5, cell_rect.y + 25))
+
+                pygame.draw.rect(screen, (0, 0, 0), cell_rect, 1)
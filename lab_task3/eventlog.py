@@ -0,0 +1,65 @@
+# eventlog.py
+# Copy of lab_task2/eventlog.py, the canonical one, kept identical so each lab
+# runs on its own. Fix it there first, then copy it over.
+import gzip
+import json
+
+
+def open_log(path, mode):
+    """Open a log as text; paths ending in .gz are gzip-compressed."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _plain(value):
+    """json.dumps fallback turning NumPy scalars and arrays into plain Python values."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class EventWriter:
+    """Appends events to a newline-delimited JSON log.
+
+    Every event is one JSON object per line whose "event" field names its
+    kind. Events are kept in memory and encoded and written in batches of
+    `buffer_size`, so logging from a run loop only costs a list append;
+    values passed to write() must therefore not be mutated afterwards.
+    """
+
+    def __init__(self, path, buffer_size=1024, append=False):
+        self.file = open_log(path, 'a' if append else 'w')
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def write(self, event, **fields):
+        self.buffer.append({'event': event, **fields})
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(''.join(json.dumps(record, separators=(',', ':'), default=_plain) + '\n'
+                                    for record in self.buffer))
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_events(path, events=None):
+    """Yield a log's events one at a time, optionally only the kinds named in `events`."""
+    with open_log(path, 'r') as f:
+        for line in f:
+            record = json.loads(line)
+            if events is None or record['event'] in events:
+                yield record
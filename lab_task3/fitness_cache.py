@@ -0,0 +1,57 @@
+# fitness_cache.py
+from collections import OrderedDict
+
+import numpy as np
+from chromosome import Chromosome
+
+
+def schedule_key(schedule):
+    """Compact hashable encoding of a schedule: (slot, student) per class.
+
+    Every schedule in a population lists the classes in the same order, so
+    the class ids do not need to be part of the key. Array-backed schedules
+    use their raw gene bytes.
+    """
+    if isinstance(schedule, Chromosome):
+        return schedule.key()
+    if isinstance(schedule, np.ndarray):
+        return schedule.tobytes()
+    return tuple((assignment['time_slot'], assignment['student']) for assignment in schedule)
+
+
+class FitnessCache:
+    """Bounded LRU cache of fitness scores keyed by schedule_key()."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.scores)
+
+    def get(self, key):
+        """Return the cached score for key, or None if it has not been scored."""
+        score = self.scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        self.scores[key] = score
+        self.scores.move_to_end(key)
+        if len(self.scores) > self.maxsize:
+            self.scores.popitem(last=False)  # Evict the least recently used schedule
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.scores),
+        }
@@ -0,0 +1,108 @@
+# fitness_engine.py
+import numpy as np
+from chromosome import Chromosome
+
+
+class FitnessEngine:
+    """Scores a whole population of schedules in one vectorized pass.
+
+    A population is an integer array of shape (pop, classes, 2): entry
+    [i, c] holds the (time_slot, student) assigned to class c in schedule i.
+    Scores match genetic.fitness() up to floating point summation order.
+    """
+
+    def __init__(self, environment):
+        self.environment = environment
+        self.num_classes = environment.num_classes
+        self.num_students = environment.num_students
+        self.num_time_slots = environment.num_time_slots
+
+        # Per-class priority and duration, indexed by class id
+        self.priority = np.asarray(environment.class_priority, dtype=np.int64)
+        self.duration = np.asarray(environment.class_duration, dtype=np.int64)
+        self.priority_weight = self.priority / 5.0
+        self.max_duration = int(self.duration.max()) if self.num_classes else 1
+
+        # Same order generate_assignments() lists the classes in
+        self.class_order = np.argsort(-self.priority, kind='stable').tolist()
+
+        # Student x slot matrices
+        self.availability = environment.availability
+        self.preference = environment.preference
+
+        # Placement score before priority weighting: preference bonus or unavailable penalty
+        self.placement = np.where(self.availability, self.preference.astype(np.float64) * 10, -20.0)
+
+        # Classes may run past the last slot, so overlap cells span a few extra slots
+        self.span = self.num_time_slots + self.max_duration - 1
+
+    def encode(self, schedule):
+        """Convert a schedule into a (classes, 2) array."""
+        if isinstance(schedule, Chromosome):
+            return schedule.genes
+        if isinstance(schedule, np.ndarray):
+            return schedule
+        row = np.zeros((self.num_classes, 2), dtype=np.int64)
+        for assignment in schedule:
+            row[assignment['class_id']] = (assignment['time_slot'], assignment['student'])
+        return row
+
+    def encode_population(self, population):
+        """Convert a list of schedules into a (pop, classes, 2) array."""
+        if isinstance(population, np.ndarray):
+            return population
+        if not population:
+            return np.zeros((0, self.num_classes, 2), dtype=np.int64)
+        return np.stack([self.encode(schedule) for schedule in population])
+
+    def decode(self, row):
+        """Convert a (classes, 2) array back into a list-of-dicts schedule."""
+        return [{'class_id': class_id,
+                 'time_slot': int(row[class_id, 0]),
+                 'student': int(row[class_id, 1])}
+                for class_id in self.class_order]
+
+    def evaluate(self, population):
+        """Return the fitness of every schedule in a (pop, classes, 2) array."""
+        placement, overlap = self.components(population)
+        return np.maximum(100.0 + placement - 30.0 * overlap / 5.0, 0.0)
+
+    def components(self, population):
+        """Placement total and overlap weight of every schedule, before evaluate() combines them."""
+        population = np.asarray(population, dtype=np.int64)
+        slots = population[..., 0]
+        students = population[..., 1]
+        placement = (self.priority_weight * self.placement[students, slots]).sum(axis=1)
+        return placement, self.overlap_weight(slots, students)
+
+    def overlap_weight(self, slots, students):
+        """Sum of the priorities of every class that lands on an already occupied hour.
+
+        genetic.fitness() visits classes by descending priority and penalises every
+        class that covers an hour its student already has. Within one
+        (schedule, student, hour) cell that means every covering class except
+        the highest-priority one is penalised, so the order of the visit does
+        not matter and the cells can be grouped with a single sort.
+        """
+        pop = slots.shape[0]
+        cell = (np.arange(pop)[:, None] * self.num_students + students) * self.span + slots
+
+        keys = []
+        for offset in range(self.max_duration):
+            covers = self.duration > offset
+            # Pack cell id and priority (1-5) into one key so a plain sort groups them
+            keys.append((((cell[:, covers] + offset) << 3) | self.priority[covers]).ravel())
+        keys = np.sort(np.concatenate(keys))
+        if keys.size == 0:
+            return np.zeros(pop)
+
+        cells = keys >> 3
+        priority = keys & 7
+        # The last entry of each cell group carries the cell's highest priority
+        last = np.ones(keys.size, dtype=bool)
+        last[:-1] = cells[:-1] != cells[1:]
+
+        individual = cells // (self.num_students * self.span)
+        total = np.bincount(individual, weights=priority, minlength=pop)
+        kept = np.bincount(individual[last], weights=priority[last], minlength=pop)
+        return total - kept
@@ -0,0 +1,64 @@
+# genetic.py
+import random
+from chromosome import Chromosome, as_schedule
+
+def fitness(schedule, environment):
+    schedule = as_schedule(schedule)
+    total_score = 100.0  # Start with maximum score
+    
+    # Track assigned slots per student to check for overlapping
+    assigned_slots = {student: {} for student in range(environment.num_students)}
+    
+    # Sort schedule by class priority
+    sorted_schedule = sorted(schedule, 
+                           key=lambda x: environment.classes[x['class_id']]['priority'],
+                           reverse=True)
+    
+    availability = environment.availability
+    preference = environment.preference
+    for assignment in sorted_schedule:
+        time_slot = assignment['time_slot']
+        student = assignment['student']
+        class_info = environment.classes[assignment['class_id']]
+        
+        # Priority-based scoring
+        priority_weight = class_info['priority'] / 5.0  # Normalize priority
+        
+        # Add points for correct placement
+        if availability[student, time_slot]:
+            # Add points based on student preference
+            total_score += float(preference[student, time_slot]) * priority_weight * 10
+        else:
+            # Deduct points for unavailable slots
+            total_score -= 20.0 * priority_weight
+            
+        # Check for overlapping classes
+        for t in range(time_slot, time_slot + class_info['duration']):
+            if t in assigned_slots[student]:
+                total_score -= 30.0 * priority_weight  # Heavy deduction for overlaps
+            assigned_slots[student][t] = assignment['class_id']
+            
+    return max(0, total_score)  # Ensure score doesn't go negative
+
+def crossover(parent1, parent2, out=None, rng=random):
+    point = rng.randint(1, len(parent1) - 1)
+    if isinstance(parent1, Chromosome):
+        # Writes into `out` when given, so no per-child allocation
+        return parent1.crossover(parent2, point, out)
+    child = parent1[:point] + parent2[point:]
+    return child
+
+def mutate(schedule, environment, mutation_rate=0.2, rng=random):
+    if rng.random() < mutation_rate:
+        idx = rng.randint(0, len(schedule) - 1)
+        time_slot = rng.randint(0, environment.num_time_slots - 1)
+        student = rng.randint(0, environment.num_students - 1)
+        if isinstance(schedule, Chromosome):
+            schedule.set_gene(idx, time_slot, student)
+        else:
+            schedule[idx] = {
+                'class_id': schedule[idx]['class_id'],
+                'time_slot': time_slot,
+                'student': student
+            }
+    return schedule
@@ -0,0 +1,242 @@
+# islands.py
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from chromosome import Chromosome
+from environment import Environment
+from optimizer import GeneticOptimizer, stop_arguments, stop_conditions
+
+
+def ring(num_islands, rng):
+    """Each island receives from the one before it."""
+    return [[(i - 1) % num_islands] for i in range(num_islands)]
+
+
+def fully_connected(num_islands, rng):
+    """Each island receives from every other island."""
+    return [[j for j in range(num_islands) if j != i] for i in range(num_islands)]
+
+
+def random_pairs(num_islands, rng):
+    """Each island receives from one other island, drawn afresh at every migration."""
+    return [[rng.choice([j for j in range(num_islands) if j != i] or [i])] for i in range(num_islands)]
+
+
+# Topology name -> function returning, for every island, the islands it receives migrants from
+TOPOLOGIES = {'ring': ring, 'fully-connected': fully_connected, 'random': random_pairs}
+
+
+class Island:
+    """One sub-population: a GeneticOptimizer that trades elite schedules with others."""
+
+    def __init__(self, environment, seed=None, population_size=50, num_parents=25,
+                 mutation_rate=0.2, cache_size=10000, migrants=2):
+        # Each island draws from its own streams. A seed of None draws fresh
+        # entropy, so forked islands never share a stream.
+        self.rng = random.Random(seed)
+        self.random_state = np.random.RandomState(seed)
+        self.optimizer = GeneticOptimizer(environment, population_size, num_parents, mutation_rate,
+                                          cache_size=cache_size, rng=self.rng, random_state=self.random_state)
+        self.migrants = migrants
+
+    def evolve(self, generations, immigrants):
+        """Take in (genes, score) immigrants, evolve for `generations` and report the result."""
+        optimizer = self.optimizer
+        if immigrants:
+            immigrants = immigrants[:optimizer.population_size]
+            optimizer.replace_worst([genes for genes, _ in immigrants], [score for _, score in immigrants])
+        for _ in range(generations):
+            optimizer.step()
+
+        elites = np.argsort(-optimizer.scores, kind='stable')[:self.migrants]
+        return {
+            'generation': optimizer.generation,
+            'best_fitness': optimizer.current_fitness,
+            'max_fitness': optimizer.max_fitness_achieved,
+            'best': optimizer.current_best.genes,
+            'best_ever': optimizer.best_schedule.genes,
+            'elites': [(optimizer.schedule(optimizer.population[i]).genes, float(optimizer.scores[i]))
+                       for i in elites],
+            'scores': optimizer.scores.copy(),
+            'diversity': optimizer.diversity(),
+        }
+
+    def close(self):
+        self.optimizer.close()
+
+
+def _island_worker(connection, environment, seed, settings):
+    island = Island(environment, seed, **settings)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        connection.send(island.evolve(*message))
+    island.close()
+    connection.close()
+
+
+class IslandOptimizer:
+    """Runs several GA sub-populations ("islands") side by side with periodic migration.
+
+    Each island is a full GeneticOptimizer in its own process (or in this
+    one with processes=False). Every `migration_interval` generations each
+    island sends copies of its `migrants` best schedules to the islands
+    that receive from it under `topology`, where they replace the worst.
+    Observers see the same attributes as on GeneticOptimizer, taken over
+    all islands, plus island_fitness and island_max per island.
+    `diversity()` is the mean of the islands' own diversity.
+    """
+
+    def __init__(self, environment, islands=None, population_size=50, num_parents=25,
+                 mutation_rate=0.2, migration_interval=10, migrants=2, topology='ring',
+                 processes=True, cache_size=10000, seed=None):
+        self.environment = environment
+        self.num_islands = islands or os.cpu_count() or 1
+        self.migration_interval = migration_interval
+        self.topology = TOPOLOGIES[topology]
+        self.rng = random.Random(seed)
+        settings = {'population_size': population_size, 'num_parents': num_parents,
+                    'mutation_rate': mutation_rate, 'cache_size': cache_size, 'migrants': migrants}
+        seeds = [None if seed is None else seed + i for i in range(self.num_islands)]
+
+        self.islands = None
+        self.connections = []
+        self.processes = []
+        if processes:
+            # The environment is sent to each island process once, when it starts
+            for island_seed in seeds:
+                connection, island_end = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_island_worker, daemon=True,
+                                                  args=(island_end, environment, island_seed, settings))
+                process.start()
+                island_end.close()
+                self.connections.append(connection)
+                self.processes.append(process)
+        else:
+            self.islands = [Island(environment, island_seed, **settings) for island_seed in seeds]
+
+        self.immigrants = [[] for _ in range(self.num_islands)]
+        self.generation = 0
+        self.current_best = None
+        self.current_fitness = 0
+        self.max_fitness_achieved = 0
+        self.best_schedule = None
+        self.stop_reason = None
+        self.island_diversity = [1.0] * self.num_islands
+        self.scores = np.zeros(0)
+        self.island_fitness = [0] * self.num_islands
+        self.island_max = [0] * self.num_islands
+
+    def evolve(self, generations):
+        """Run every island for `generations` generations at once and collect their reports."""
+        if self.islands is not None:
+            return [island.evolve(generations, immigrants)
+                    for island, immigrants in zip(self.islands, self.immigrants)]
+        for connection, immigrants in zip(self.connections, self.immigrants):
+            connection.send((generations, immigrants))
+        return [connection.recv() for connection in self.connections]
+
+    def step(self, generations=None):
+        """Evolve every island for one migration interval, then migrate."""
+        reports = self.evolve(generations or self.migration_interval)
+        self.generation = reports[0]['generation']
+        self.island_fitness = [report['best_fitness'] for report in reports]
+        self.island_max = [report['max_fitness'] for report in reports]
+        self.scores = np.concatenate([report['scores'] for report in reports])
+        self.island_diversity = [report['diversity'] for report in reports]
+
+        best = int(np.argmax(self.island_fitness))
+        self.current_best = Chromosome(reports[best]['best'])
+        self.current_fitness = self.island_fitness[best]
+        best_ever = int(np.argmax(self.island_max))
+        if self.best_schedule is None or self.island_max[best_ever] > self.max_fitness_achieved:
+            self.best_schedule = Chromosome(reports[best_ever]['best_ever'])
+            self.max_fitness_achieved = self.island_max[best_ever]
+
+        sources = self.topology(self.num_islands, self.rng)
+        self.immigrants = [[elite for source in sources[i] if source != i for elite in reports[source]['elites']]
+                           for i in range(self.num_islands)]
+
+    def diversity(self):
+        return sum(self.island_diversity) / self.num_islands
+
+    def run(self, generations=100, observers=(), stop=None):
+        """Evolve like GeneticOptimizer.run(), calling observers and `stop` after every migration."""
+        if stop:
+            stop.start(self)
+        self.stop_reason = 'generations'
+        while generations is None or self.generation < generations:
+            remaining = self.migration_interval if generations is None else generations - self.generation
+            self.step(min(self.migration_interval, remaining))
+            results = [observer(self) for observer in observers]
+            if any(result is False for result in results):
+                self.stop_reason = 'observer'
+                break
+            reason = stop.check(self) if stop else None
+            if reason:
+                self.stop_reason = reason
+                break
+        return self.best_schedule
+
+    def close(self):
+        if self.islands is not None:
+            for island in self.islands:
+                island.close()
+            return
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the schedule GA as migrating islands.")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--students", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--islands", type=int, default=0, help="0 runs one island per core")
+    parser.add_argument("--population", type=int, default=50, help="population of each island")
+    parser.add_argument("--parents", type=int, default=25)
+    parser.add_argument("--generations", type=int, default=100, help="0 for no limit")
+    parser.add_argument("--interval", type=int, default=10, help="generations between migrations")
+    parser.add_argument("--migrants", type=int, default=2, help="elites each island sends per migration")
+    parser.add_argument("--topology", choices=list(TOPOLOGIES), default='ring')
+    parser.add_argument("--serial", action="store_true", help="run every island in this process")
+    parser.add_argument("--seed", type=int)
+    stop_arguments(parser)
+    args = parser.parse_args()
+
+    environment = Environment(args.classes, args.students, args.slots, seed=args.seed)
+
+    with IslandOptimizer(environment, args.islands or None, args.population, args.parents,
+                         migration_interval=args.interval, migrants=args.migrants,
+                         topology=args.topology, processes=not args.serial,
+                         seed=args.seed) as optimizer:
+        start = time.perf_counter()
+        optimizer.run(args.generations or None, stop=stop_conditions(args))
+        elapsed = time.perf_counter() - start
+
+    for i, (fitness, max_fitness) in enumerate(zip(optimizer.island_fitness, optimizer.island_max)):
+        print(f"Island {i}: Best Fitness (Current): {fitness:.2f}, Max Fitness Achieved: {max_fitness:.2f}")
+    print(f"Generations: {optimizer.generation}")
+    print(f"Global Max Fitness Achieved: {optimizer.max_fitness_achieved:.2f}")
+    print(f"Stopped: {optimizer.stop_reason} after {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
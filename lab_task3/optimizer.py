@@ -0,0 +1,450 @@
+# optimizer.py
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from chromosome import Chromosome
+from delta_fitness import DeltaEvaluator
+from environment import Environment
+from eventlog import EventWriter
+from fitness_cache import FitnessCache, schedule_key
+from fitness_engine import FitnessEngine
+from genetic import crossover, mutate
+from telemetry import Telemetry
+
+# Set once in every worker process by the pool initializer
+_worker_engine = None
+
+
+def _init_worker(environment):
+    global _worker_engine
+    _worker_engine = FitnessEngine(environment)
+
+
+def _evaluate_chunk(chunk):
+    return _worker_engine.evaluate(_worker_engine.encode_population(chunk))
+
+
+class SerialEvaluator:
+    """Scores populations in the calling process."""
+
+    def __init__(self, environment):
+        self.engine = FitnessEngine(environment)
+
+    def evaluate(self, population):
+        return self.engine.evaluate(self.engine.encode_population(population))
+
+    def close(self):
+        pass
+
+
+class ProcessPoolEvaluator:
+    """Spreads population scoring across a pool of worker processes.
+
+    The environment is handed to each worker once through the pool
+    initializer, so tasks only carry the schedules being scored.
+    """
+
+    def __init__(self, environment, workers=None, chunks_per_worker=2):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            initializer=_init_worker,
+                                            initargs=(environment,))
+
+    def evaluate(self, population):
+        num_chunks = min(len(population), self.workers * self.chunks_per_worker)
+        if num_chunks == 0:
+            return np.zeros(0)
+        size = -(-len(population) // num_chunks)  # Ceiling division
+        chunks = [population[i:i + size] for i in range(0, len(population), size)]
+        return np.concatenate(list(self.executor.map(_evaluate_chunk, chunks)))
+
+    def close(self):
+        self.executor.shutdown()
+
+
+class CachedEvaluator:
+    """Wraps another evaluator so repeated schedules are only scored once."""
+
+    def __init__(self, evaluator, cache):
+        self.evaluator = evaluator
+        self.cache = cache
+
+    def evaluate(self, population):
+        scores = np.empty(len(population))
+        missing = {}  # Unscored key -> every index holding that schedule
+        for i, schedule in enumerate(population):
+            key = schedule_key(schedule)
+            if key in missing:
+                # Duplicate within this generation: scored once with its first copy
+                self.cache.hits += 1
+                missing[key].append(i)
+                continue
+            score = self.cache.get(key)
+            if score is None:
+                missing[key] = [i]
+            else:
+                scores[i] = score
+
+        if missing:
+            fresh = self.evaluator.evaluate([population[indices[0]] for indices in missing.values()])
+            for (key, indices), score in zip(missing.items(), fresh):
+                self.cache.put(key, float(score))
+                scores[indices] = score
+        return scores
+
+    def close(self):
+        self.evaluator.close()
+
+
+class StopConditions:
+    """Decides when a run has gone on long enough, and says why.
+
+    Any combination may be set: a number of `stall_generations` without a
+    new best-ever fitness, a `target_fitness`, a wall-clock `time_budget` in
+    seconds, and a `min_diversity` fraction of distinct schedules below
+    which the population counts as converged.
+    """
+
+    def __init__(self, stall_generations=None, target_fitness=None, time_budget=None, min_diversity=None):
+        self.stall_generations = stall_generations
+        self.target_fitness = target_fitness
+        self.time_budget = time_budget
+        self.min_diversity = min_diversity
+
+    def start(self, optimizer):
+        self.started = time.perf_counter()
+        self.best_fitness = optimizer.max_fitness_achieved
+        self.improved_at = optimizer.generation
+
+    def check(self, optimizer):
+        """Return the reason to stop after the latest generation, or None to carry on."""
+        if optimizer.max_fitness_achieved > self.best_fitness:
+            self.best_fitness = optimizer.max_fitness_achieved
+            self.improved_at = optimizer.generation
+        if self.target_fitness is not None and optimizer.max_fitness_achieved >= self.target_fitness:
+            return 'target_fitness'
+        if self.stall_generations is not None and optimizer.generation - self.improved_at >= self.stall_generations:
+            return 'stalled'
+        if self.time_budget is not None and time.perf_counter() - self.started >= self.time_budget:
+            return 'time_budget'
+        if self.min_diversity is not None and optimizer.diversity() < self.min_diversity:
+            return 'converged'
+        return None
+
+
+def stop_arguments(parser):
+    """Add the StopConditions options to an argparse parser."""
+    parser.add_argument("--stall", type=int, help="stop after this many generations without a new best")
+    parser.add_argument("--target", type=float, help="stop once this fitness is reached")
+    parser.add_argument("--time-budget", type=float, help="stop after this many seconds")
+    parser.add_argument("--min-diversity", type=float,
+                        help="stop once fewer than this fraction of the population are distinct")
+
+
+def stop_conditions(args):
+    """StopConditions from parsed stop_arguments(), or None if none were given."""
+    if args.stall is None and args.target is None and args.time_budget is None and args.min_diversity is None:
+        return None
+    return StopConditions(args.stall, args.target, args.time_budget, args.min_diversity)
+
+
+class GenerationLog:
+    """Observer writing a summary of every generation it sees to an EventWriter.
+
+    The environment is written first so a log can be replayed on its own;
+    `schedules=False` leaves each generation's best schedule out.
+    """
+
+    def __init__(self, log, environment, schedules=True):
+        self.log = log
+        self.schedules = schedules
+        log.write('environment', **environment.describe())
+
+    def __call__(self, optimizer):
+        fields = {}
+        if self.schedules:
+            fields['schedule'] = optimizer.current_best.genes
+        self.log.write('generation', generation=optimizer.generation,
+                       best_fitness=optimizer.current_fitness,
+                       mean_fitness=float(np.mean(optimizer.scores)),
+                       max_fitness=optimizer.max_fitness_achieved, **fields)
+
+
+class GeneticOptimizer:
+    """Runs the scheduler GA without any display.
+
+    The population is a pair of (pop, classes, 2) gene buffers with
+    Chromosome row views, so breeding a generation allocates nothing.
+    Observers are callables taking the optimizer; they are called every
+    `observe_every` generations and may return False to stop the run.
+    Scores are memoised in an LRU cache of `cache_size` schedules (0 disables it).
+    The best schedule of any generation so far is kept in best_schedule.
+    A telemetry.PhaseTimer in `profile` (see Telemetry.attach()) is told
+    where each generation's time goes.
+    Selection, crossover and mutation draw from `rng` (a random.Random,
+    the global stream by default) and the initial population from
+    `random_state` (a np.random.RandomState, the environment's by default).
+    """
+
+    def __init__(self, environment, population_size=50, num_parents=25,
+                 mutation_rate=0.2, workers=1, cache_size=10000, rng=None, random_state=None):
+        self.environment = environment
+        self.population_size = population_size
+        self.num_parents = num_parents
+        self.mutation_rate = mutation_rate
+        self.rng = rng or random
+        self.random_state = random_state
+        if workers == 1:
+            self.evaluator = SerialEvaluator(environment)
+        else:
+            self.evaluator = ProcessPoolEvaluator(environment, workers)
+        self.cache = None
+        if cache_size:
+            self.cache = FitnessCache(cache_size)
+            self.evaluator = CachedEvaluator(self.evaluator, self.cache)
+
+        self.population = self.initial_population()
+        self.scores = self.evaluate(self.population)
+        self.generation = 0
+        self.current_best = None
+        self.current_fitness = 0
+        self.max_fitness_achieved = 0
+        self.best_schedule = None
+        self.stop_reason = None
+        self.profile = None
+
+    def initial_population(self):
+        # Two generation buffers; each generation's children are written into the spare one
+        genes = self.environment.generate_population(self.population_size, self.random_state)
+        self.buffers = [genes, np.empty_like(genes)]
+        self.chromosomes = [[Chromosome(row) for row in buffer] for buffer in self.buffers]
+        return self.chromosomes[0]
+
+    def breed(self, parents):
+        # Parents are views into the current buffer, so swap and overwrite the other one
+        self.buffers.reverse()
+        self.chromosomes.reverse()
+        next_gen = self.chromosomes[0]
+        profile = self.profile
+        rng = self.rng
+        if profile is None:
+            for child in next_gen:
+                parent1, parent2 = rng.choices(parents, k=2)
+                mutate(crossover(parent1, parent2, child, rng), self.environment, self.mutation_rate, rng)
+            return next_gen
+        for child in next_gen:
+            parent1, parent2 = rng.choices(parents, k=2)
+            profile.lap('select')
+            crossover(parent1, parent2, child, rng)
+            profile.lap('crossover')
+            mutate(child, self.environment, self.mutation_rate, rng)
+            profile.lap('mutate')
+        return next_gen
+
+    def evaluate(self, population):
+        # The chromosomes are row views of the current buffer, so score the buffer directly
+        return self.evaluator.evaluate(self.buffers[0])
+
+    def schedule(self, individual):
+        """Return a standalone copy of an individual for observers to keep."""
+        return individual.copy()
+
+    def population_genes(self):
+        """The current population as a (pop, classes, 2) array."""
+        return self.buffers[0]
+
+    def unique_schedules(self):
+        """Number of distinct schedules in the population."""
+        return len({individual.tobytes() for individual in self.population_genes()})
+
+    def diversity(self):
+        """Fraction of the population that are distinct schedules."""
+        return self.unique_schedules() / len(self.population)
+
+    def replace_worst(self, schedules, scores):
+        """Overwrite the lowest-scoring individuals with (classes, 2) gene arrays and their scores."""
+        worst = np.argsort(self.scores, kind='stable')[:len(schedules)]
+        for i, genes, score in zip(worst, schedules, scores):
+            self.population[i].genes[:] = genes
+            self.scores[i] = score
+
+    def step(self):
+        """Breed one generation from the top-ranked parents and score it."""
+        profile = self.profile
+        if profile:
+            profile.start()
+        ranking = np.argsort(-self.scores, kind='stable')
+        parents = [self.population[i] for i in ranking[:self.num_parents]]
+        if profile:
+            profile.lap('sort')
+
+        self.population = self.breed(parents)
+        self.scores = self.evaluate(self.population)
+        self.generation += 1
+        if profile:
+            profile.lap('fitness')
+
+        best_index = int(np.argmax(self.scores))
+        self.current_best = self.schedule(self.population[best_index])
+        self.current_fitness = float(self.scores[best_index])
+        if self.best_schedule is None or self.current_fitness > self.max_fitness_achieved:
+            self.best_schedule = self.current_best
+        self.max_fitness_achieved = max(self.max_fitness_achieved, self.current_fitness)
+        if profile:
+            profile.lap('best')
+
+    def run(self, generations=100, observers=(), observe_every=1, stop=None):
+        """Evolve until `generations` (None for no limit), an observer or `stop` ends the run.
+
+        Returns the best schedule found; stop_reason says why the run ended:
+        'generations', 'observer' or the reason given by the StopConditions.
+        """
+        if stop:
+            stop.start(self)
+        self.stop_reason = 'generations'
+        while generations is None or self.generation < generations:
+            self.step()
+            if self.generation % observe_every == 0 or self.generation == generations:
+                # Evaluate every observer so none misses a sample, then honour stop requests
+                results = [observer(self) for observer in observers]
+                if any(result is False for result in results):
+                    self.stop_reason = 'observer'
+                    break
+            reason = stop.check(self) if stop else None
+            if reason:
+                self.stop_reason = reason
+                break
+        return self.best_schedule
+
+    def close(self):
+        self.evaluator.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DeltaGeneticOptimizer(GeneticOptimizer):
+    """GeneticOptimizer whose children are scored incrementally from their parents.
+
+    Individuals are ScoredSchedule arrays carrying their score components.
+    `verify=True` cross-checks every child against full evaluation. Children
+    close to their base parent are scored inside crossover and mutation; the
+    rest are scored together in the fitness phase.
+    """
+
+    def __init__(self, environment, population_size=50, num_parents=25,
+                 mutation_rate=0.2, verify=False, rng=None, random_state=None):
+        self.engine = FitnessEngine(environment)
+        self.delta = DeltaEvaluator(self.engine, verify)
+        super().__init__(environment, population_size, num_parents, mutation_rate,
+                         workers=1, cache_size=0, rng=rng, random_state=random_state)
+
+    def initial_population(self):
+        super().initial_population()
+        return self.delta.batch(self.buffers[0])
+
+    def breed(self, parents):
+        num_classes = self.environment.num_classes
+        profile = self.profile
+        self.delta.prepare(parents)  # Counts of the parents scored in the last batch, all at once
+        if profile:
+            profile.lap('fitness')
+        rng = self.rng
+        next_gen = []
+        for _ in range(self.population_size):
+            parent1, parent2 = rng.choices(parents, k=2)
+            if profile:
+                profile.lap('select')
+            child = self.delta.crossover(parent1, parent2, rng.randint(1, num_classes - 1))
+            if profile:
+                profile.lap('crossover')
+            if rng.random() < self.mutation_rate:
+                self.delta.mutate(child, rng.randint(0, num_classes - 1),
+                                  rng.randint(0, self.environment.num_time_slots - 1),
+                                  rng.randint(0, self.environment.num_students - 1))
+            if profile:
+                profile.lap('mutate')
+            next_gen.append(child)
+        return next_gen
+
+    def evaluate(self, population):
+        self.delta.flush()
+        return np.array([individual.score for individual in population])
+
+    def population_genes(self):
+        return np.stack([individual.genes for individual in self.population])
+
+    def replace_worst(self, schedules, scores):
+        worst = np.argsort(self.scores, kind='stable')[:len(schedules)]
+        for i, genes in zip(worst, schedules):
+            self.population[i] = self.delta.full(np.array(genes))
+            self.scores[i] = self.population[i].score
+
+    def schedule(self, individual):
+        return Chromosome(individual.genes.copy())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the schedule GA headlessly.")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--students", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--population", type=int, default=50)
+    parser.add_argument("--parents", type=int, default=25)
+    parser.add_argument("--generations", type=int, default=100, help="0 for no limit")
+    parser.add_argument("--workers", type=int, default=1, help="0 uses every core")
+    parser.add_argument("--cache-size", type=int, default=10000, help="0 disables the fitness cache")
+    parser.add_argument("--delta", action="store_true", help="score children incrementally")
+    parser.add_argument("--verify", action="store_true", help="cross-check delta scores")
+    parser.add_argument("--log", help="write a per-generation event log here")
+    parser.add_argument("--telemetry-log", help="write per-generation timings, throughput and diversity here")
+    parser.add_argument("--seed", type=int, help="seed for a reproducible environment")
+    stop_arguments(parser)
+    args = parser.parse_args()
+
+    environment = Environment(args.classes, args.students, args.slots, seed=args.seed)
+    if args.delta or args.verify:
+        optimizer = DeltaGeneticOptimizer(environment, args.population, args.parents,
+                                          verify=args.verify)
+    else:
+        optimizer = GeneticOptimizer(environment, args.population, args.parents,
+                                     workers=args.workers or None, cache_size=args.cache_size)
+    log = EventWriter(args.log) if args.log else None
+    observers = [GenerationLog(log, environment)] if log else []
+    telemetry_log = EventWriter(args.telemetry_log) if args.telemetry_log else None
+    telemetry = Telemetry(telemetry_log).attach(optimizer) if telemetry_log else None
+    if telemetry:
+        observers.append(telemetry)
+    with optimizer:
+        start = time.perf_counter()
+        optimizer.run(args.generations or None, observers, stop=stop_conditions(args))
+        elapsed = time.perf_counter() - start
+    if log:
+        log.close()
+    if telemetry_log:
+        telemetry_log.close()
+
+    print(f"Generations: {optimizer.generation}")
+    print(f"Max Fitness Achieved: {optimizer.max_fitness_achieved:.2f}")
+    print(f"Stopped: {optimizer.stop_reason} after {elapsed:.2f}s")
+    print(f"Generations/sec: {optimizer.generation / elapsed:.1f}")
+    if optimizer.cache is not None:
+        stats = optimizer.cache.stats()
+        print(f"Fitness cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.1%} hit rate)")
+    if telemetry:
+        for line in telemetry.summary():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,156 @@
-import pygame 
+import argparse
+
 import numpy as np
+from chromosome import Chromosome, gene_dtype
 from environment import Environment
-import random
-
-def fitness(schedule, environment):
-    total_score = 100.0  # Start with maximum score
-    
-    # Track assigned slots per student to check for overlapping
-    assigned_slots = {student: {} for student in range(environment.num_students)}
-    
-    # Sort schedule by class priority
-    sorted_schedule = sorted(schedule, 
-                           key=lambda x: environment.classes[x['class_id']]['priority'],
-                           reverse=True)
-    
-    for assignment in sorted_schedule:
-        time_slot = assignment['time_slot']
-        student = assignment['student']
-        class_info = environment.classes[assignment['class_id']]
-        student_obj = environment.students[student]
-        
-        # Priority-based scoring
-        priority_weight = class_info['priority'] / 5.0  # Normalize priority
-        
-        # Add points for correct placement
-        if time_slot in student_obj.availability:
-            # Add points based on student preference
-            preference = student_obj.get_preference(time_slot)
-            total_score += preference * priority_weight * 10
-        else:
-            # Deduct points for unavailable slots
-            total_score -= 20.0 * priority_weight
-            
-        # Check for overlapping classes
-        for t in range(time_slot, time_slot + class_info['duration']):
-            if t in assigned_slots[student]:
-                total_score -= 30.0 * priority_weight  # Heavy deduction for overlaps
-            assigned_slots[student][t] = assignment['class_id']
-            
-    return max(0, total_score)  # Ensure score doesn't go negative
-
-def crossover(parent1, parent2):
-    point = random.randint(1, len(parent1) - 1)
-    child = parent1[:point] + parent2[point:]
-    return child
-
-def mutate(schedule, environment, mutation_rate=0.2):
-    if random.random() < mutation_rate:
-        idx = random.randint(0, len(schedule) - 1)
-        schedule[idx] = {
-            'class_id': schedule[idx]['class_id'],
-            'time_slot': random.randint(0, environment.num_time_slots - 1),
-            'student': random.randint(0, environment.num_students - 1)
-        }
-    return schedule
-
-def run_scheduler():
-    pygame.init()
-    screen = pygame.display.set_mode((1200, 800))
-    pygame.display.set_caption("Class Schedule Optimization")
-    font = pygame.font.Font(None, 24)
+from eventlog import EventWriter, read_events
+from loop import FixedStepLoop
+from islands import IslandOptimizer
+from optimizer import GenerationLog, GeneticOptimizer, stop_arguments, stop_conditions
+from telemetry import Telemetry
+
+
+class LoggedRun:
+    """Steps through a generation log, standing in for the optimizer in SchedulerView."""
+
+    def __init__(self, path):
+        events = read_events(path, {'environment', 'generation'})
+        self.environment = Environment.from_description(next(events))
+        self.generations = events
+        self.dtype = gene_dtype(self.environment.num_students, self.environment.num_time_slots)
+        self.generation = 0
+        self.current_best = None
+        self.current_fitness = 0
+        self.max_fitness_achieved = 0
+
+    def step(self):
+        """Advance to the next logged generation; False once the log is done."""
+        record = next(self.generations, None)
+        if record is None:
+            return False
+        self.generation = record['generation']
+        self.current_fitness = record['best_fitness']
+        self.max_fitness_achieved = record['max_fitness']
+        if 'schedule' in record:
+            self.current_best = Chromosome(np.array(record['schedule'], dtype=self.dtype))
 
+
+def run_scheduler(generations=100, tick_rate=2, frame_rate=30, max_speed=False, render=True, log=None,
+                  islands=1, stop=None, telemetry=False, telemetry_log=None):
+    """Evolve at `tick_rate` generations per second while the view redraws at `frame_rate`.
+
+    Each generation's summary and best schedule are written to the event log at `log`, if given.
+    With more than one island the populations evolve in parallel processes and
+    the view and log are updated at every migration. The run ends after
+    `generations` (None for no limit) or when the StopConditions `stop` say so,
+    and returns the best schedule found. `telemetry` profiles every
+    generation and shows it in the view; `telemetry_log` also writes it to
+    an event log there (single populations only).
+    """
     num_classes = 10
     environment = Environment(num_classes)
-    population = environment.generate_assignments()
-    
-    generation_count = 0
-    best_fitness = 0  # Initialize to minimum possible fitness
-    max_fitness_achieved = 0  # Track maximum fitness achieved
-    running = True
-    
-    while running and generation_count < 100:  # 100 generations
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        # Evolution step
-        # Sort by fitness in descending order (higher is better)
-        ranked_population = sorted(population, 
-                                 key=lambda x: fitness(x, environment),
-                                 reverse=True)  # Changed to reverse=True
-        parents = ranked_population[:25]  # Top 50%
-        
-        next_gen = []
-        for _ in range(50):  # Maintain population size
-            parent1, parent2 = random.choices(parents, k=2)
-            child = mutate(crossover(parent1, parent2), environment)
-            next_gen.append(child)
-            
-        population = next_gen
-        
-        # Display current best solution
-        current_best = max(population,  # Changed to max
-                         key=lambda x: fitness(x, environment))
-        current_fitness = fitness(current_best, environment)
-        max_fitness_achieved = max(max_fitness_achieved, current_fitness)  # Track maximum
-        
-        # Update display
-        environment.draw_grid(screen, font, current_best)
-        
-        gen_text = font.render(f"Generation: {generation_count + 1}", True, (0, 0, 0))
-        fit_text = font.render(f"Best Fitness (Current): {current_fitness:.2f}", True, (0, 0, 0))
-        max_fit_text = font.render(f"Max Fitness Achieved: {max_fitness_achieved:.2f}", True, (0, 0, 0))
-        
-        screen.blit(gen_text, (900, 50))
-        screen.blit(fit_text, (900, 80))
-        screen.blit(max_fit_text, (900, 110))
-        
-        pygame.display.flip()
-        pygame.time.delay(500)  # 500ms delay between generations
-        generation_count += 1
-        
-    pygame.quit()
+    writer = EventWriter(log) if log else None
+    generation_log = GenerationLog(writer, environment) if writer else None
+    telemetry_writer = EventWriter(telemetry_log) if telemetry_log else None
+    profiler = None
+
+    if islands > 1:
+        if telemetry or telemetry_log:
+            raise ValueError("telemetry needs a single population, not islands")
+        optimizer = IslandOptimizer(environment, islands)
+        steps_per_second = tick_rate / optimizer.migration_interval  # Each step is one migration interval
+    else:
+        optimizer = GeneticOptimizer(environment)
+        steps_per_second = tick_rate
+        if telemetry or telemetry_log:
+            profiler = Telemetry(telemetry_writer).attach(optimizer)
+
+    view = None
+    if render:
+        from view import SchedulerView  # pygame is only imported when there is a window
+        view = SchedulerView(telemetry=profiler)
+
+    if stop:
+        stop.start(optimizer)
+    optimizer.stop_reason = 'generations'
+
+    with optimizer:
+        def update():
+            if generations is not None and optimizer.generation >= generations:
+                return False
+            if islands > 1 and generations is not None:
+                # Islands step a whole migration interval, so cap the last one at the limit
+                optimizer.step(min(optimizer.migration_interval, generations - optimizer.generation))
+            else:
+                optimizer.step()
+            if generation_log:
+                generation_log(optimizer)
+            if profiler:
+                profiler(optimizer)
+            reason = stop.check(optimizer) if stop else None
+            if reason:
+                optimizer.stop_reason = reason
+                return False
+
+        def draw():
+            if view(optimizer) is False:
+                optimizer.stop_reason = 'window closed'
+                return False
+
+        loop = FixedStepLoop(update, steps_per_second,
+                             render=draw if view else None,
+                             frame_rate=frame_rate, max_speed=max_speed)
+        loop.run()
+
+    if writer:
+        writer.close()
+    if telemetry_writer:
+        telemetry_writer.close()
+    if view:
+        view.close()
+    print(f"Generations: {optimizer.generation}")
+    print(f"Max Fitness Achieved: {optimizer.max_fitness_achieved:.2f}")
+    print(f"Stopped: {optimizer.stop_reason}")
+    if profiler:
+        for line in profiler.summary():
+            print(line)
+    return optimizer.best_schedule
+
+
+def replay_run(path, tick_rate=2, frame_rate=30, max_speed=False):
+    """Play back a log written by run_scheduler() or optimizer.py --log."""
+    from view import SchedulerView
+
+    run = LoggedRun(path)
+    view = SchedulerView()
+    FixedStepLoop(run.step, tick_rate, render=lambda: view(run),
+                  frame_rate=frame_rate, max_speed=max_speed).run()
+    view.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize a class schedule with a genetic algorithm.")
+    parser.add_argument("--generations", type=int, default=100, help="0 for no limit")
+    parser.add_argument("--tick-rate", type=float, default=2, help="generations per second")
+    parser.add_argument("--fps", type=float, default=30, help="frames per second of the view")
+    parser.add_argument("--max-speed", action="store_true", help="evolve as fast as possible")
+    parser.add_argument("--no-render", action="store_true", help="run without a window")
+    parser.add_argument("--log", help="write a per-generation event log here")
+    parser.add_argument("--replay", help="show a logged run instead of evolving a new one")
+    parser.add_argument("--islands", type=int, default=1, help="evolve this many migrating populations in parallel")
+    parser.add_argument("--telemetry", action="store_true",
+                        help="profile every generation and show the timings and diversity in the window")
+    parser.add_argument("--telemetry-log", help="also write the per-generation telemetry here")
+    stop_arguments(parser)
+    args = parser.parse_args()
+    if args.islands > 1 and (args.telemetry or args.telemetry_log):
+        parser.error("--telemetry needs a single population (--islands 1)")
+    if args.replay:
+        replay_run(args.replay, args.tick_rate, args.fps, args.max_speed)
+    else:
+        run_scheduler(args.generations or None, args.tick_rate, args.fps, args.max_speed,
+                      not args.no_render, args.log, args.islands, stop_conditions(args),
+                      args.telemetry, args.telemetry_log)
 
 if __name__ == "__main__":
-    run_scheduler()
\ No newline at end of file
+    main()
@@ -0,0 +1,144 @@
+# solver.py
+import argparse
+import heapq
+import math
+import random
+import time
+
+import numpy as np
+
+from chromosome import Chromosome, gene_dtype
+from delta_fitness import DeltaEvaluator
+from environment import Environment
+from fitness_engine import FitnessEngine
+
+
+def greedy(environment, budget=None, seed=None):
+    """Place classes one at a time, by descending priority, where each adds the most fitness.
+
+    Classes are visited in the order fitness() penalises overlaps in, so a
+    class placed on an hour that is already taken always costs its own
+    priority. A placement's gain is then priority / 5 * (placement - 30 *
+    taken hours), where only the second factor depends on the cell, so the
+    cells can be kept in one max-heap per duration. Gains only ever drop,
+    which lets stale heap entries be refreshed when they surface.
+    A heuristic in general, since a class never moves once placed, but
+    exact when every class lasts one hour.
+    `budget` and `seed` are ignored: the construction is deterministic.
+    """
+    engine = FitnessEngine(environment)
+    num_students, num_slots = environment.num_students, environment.num_time_slots
+    taken = np.zeros((num_students, engine.span), dtype=bool)
+    genes = np.zeros((environment.num_classes, 2), dtype=gene_dtype(num_students, num_slots))
+
+    def gain(student, slot, duration):
+        return engine.placement[student, slot] - 30.0 * int(taken[student, slot:slot + duration].sum())
+
+    # Cell values before anything is placed, best first
+    cells = [(-value, student, slot) for (student, slot), value in np.ndenumerate(engine.placement)]
+    heapq.heapify(cells)
+    heaps = {int(duration): list(cells) for duration in np.unique(engine.duration)}
+
+    for class_id in engine.class_order:
+        duration = int(engine.duration[class_id])
+        heap = heaps[duration]
+        while True:
+            value, student, slot = heap[0]
+            current = gain(student, slot, duration)
+            if current == -value:
+                break
+            heapq.heapreplace(heap, (-current, student, slot))
+        taken[student, slot:slot + duration] = True
+        genes[class_id] = (slot, student)
+    return Chromosome(genes)
+
+
+def anneal(environment, budget=1.0, seed=None, start=None, initial_temperature=5.0,
+           final_temperature=0.05):
+    """Simulated annealing over single-class moves for `budget` seconds.
+
+    Starts from greedy() unless `start` is given. Every move reassigns one
+    class to a random (slot, student) and is scored in O(duration) by the
+    DeltaEvaluator; worse moves are kept with the Metropolis probability at
+    a temperature that cools geometrically over the budget. Returns the
+    best schedule seen.
+    """
+    rng = random.Random(seed)
+    evaluator = DeltaEvaluator(FitnessEngine(environment))
+    current = evaluator.full((start if start is not None else greedy(environment)).genes)
+    best = current.genes.copy()
+
+    def energy(individual):
+        # Fitness before clamping at 0, so moves still register on very poor schedules
+        return individual.placement_total - 30.0 * individual.overlap / 5.0
+
+    score = best_score = energy(current)
+    num_classes, num_slots, num_students = environment.num_classes, environment.num_time_slots, environment.num_students
+    if num_classes == 0:
+        return Chromosome(best.astype(gene_dtype(num_students, num_slots)))
+
+    started = time.perf_counter()
+    temperature = initial_temperature
+    cooling = math.log(final_temperature / initial_temperature)
+    moves = 0
+    while True:
+        # Checking the clock is costly next to a move, so do it in batches
+        if moves % 256 == 0:
+            elapsed = (time.perf_counter() - started) / budget if budget else 1.0
+            if elapsed >= 1.0:
+                break
+            temperature = initial_temperature * math.exp(cooling * elapsed)
+        moves += 1
+
+        class_id = rng.randrange(num_classes)
+        old_slot, old_student = current.genes[class_id]
+        evaluator.mutate(current, class_id, rng.randrange(num_slots), rng.randrange(num_students))
+        new_score = energy(current)
+        change = new_score - score
+        if change >= 0 or rng.random() < math.exp(change / temperature):
+            score = new_score
+            if score > best_score + 1e-9:
+                best_score = score
+                best[:] = current.genes
+        else:
+            evaluator.mutate(current, class_id, old_slot, old_student)
+
+    return Chromosome(best.astype(gene_dtype(num_students, num_slots)))
+
+
+# Solver name -> function(environment, budget, seed) returning the best Chromosome found
+SOLVERS = {'greedy': greedy, 'anneal': anneal}
+
+
+def solve(environment, budget=1.0, method='anneal', seed=None):
+    """Solve the scheduling problem directly, without the GA.
+
+    `budget` is the time in seconds a solver may use; 'greedy' finishes as
+    soon as every class is placed. Schedules are scored by the same
+    FitnessEngine the GA uses.
+    """
+    return SOLVERS[method](environment, budget, seed=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve the schedule directly instead of with the GA.")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--students", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--method", choices=list(SOLVERS), default='anneal')
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds the solver may use")
+    parser.add_argument("--seed", type=int, help="seed for a reproducible environment and search")
+    args = parser.parse_args()
+
+    environment = Environment(args.classes, args.students, args.slots, seed=args.seed)
+    start = time.perf_counter()
+    schedule = solve(environment, args.budget, args.method, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    fitness = FitnessEngine(environment).evaluate(schedule.genes[None])[0]
+
+    print(f"Fitness: {fitness:.2f}")
+    print(f"Solved with {args.method} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# startup_benchmark.py
+# Copy of lab_task2/startup_benchmark.py, the canonical one, except for WORKER and
+# CASES, which are specific to each lab. Fix the rest there first, then copy it over.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# A short-lived batch worker: build a problem, solve it greedily and report whether pygame was loaded
+WORKER = """
+import sys
+from environment import Environment
+from solver import solve
+solve(Environment(10, seed=0), method='greedy')
+print('pygame' in sys.modules)
+"""
+
+# The same worker paying for pygame up front, as every module importing environment.py used to
+CASES = {'headless': WORKER, 'with pygame': "import pygame\n" + WORKER}
+
+
+def time_case(code, runs):
+    """Wall times of `runs` fresh interpreters running code, and whether pygame was loaded."""
+    environment = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    directory = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], cwd=directory, env=environment,
+                                capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+    return times, result.stdout.strip() == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the startup of a batch worker with and without pygame.")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters started per case")
+    args = parser.parse_args()
+
+    medians = {}
+    for name, code in CASES.items():
+        times, loaded = time_case(code, args.runs)
+        medians[name] = statistics.median(times)
+        print(f"{name:>12}: median {medians[name] * 1000:7.1f} ms, min {min(times) * 1000:7.1f} ms, "
+              f"pygame loaded: {loaded}")
+    saving = medians['with pygame'] - medians['headless']
+    print(f"Saving per worker: {saving * 1000:.1f} ms ({saving / medians['with pygame']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
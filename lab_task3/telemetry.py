@@ -0,0 +1,101 @@
+# telemetry.py
+import collections
+import time
+
+import numpy as np
+
+# Phases of GeneticOptimizer.step(), in the order they run
+PHASES = ('sort', 'select', 'crossover', 'mutate', 'fitness', 'best')
+
+
+class PhaseTimer:
+    """Wall time spent in each phase of the latest generation.
+
+    lap(phase) charges the time since the previous lap (or start()) to
+    phase, so timing a generation costs one perf_counter() call per lap.
+    """
+
+    def __init__(self):
+        self.start()
+
+    def start(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.times[phase] += now - self.last
+        self.last = now
+
+
+class Telemetry:
+    """Observer recording how a GeneticOptimizer spends each generation.
+
+    attach() gives the optimizer a PhaseTimer; every call then records the
+    latest generation's phase times, evaluations per second (children
+    scored over the generation's wall time, cache hits included), the
+    number of distinct schedules and the min/mean/max/std of the scores.
+    Records are written to `log` (an EventWriter) as 'telemetry' events if
+    given, and the last `history` of them are kept in `records`.
+    """
+
+    def __init__(self, log=None, history=1000):
+        self.log = log
+        self.records = collections.deque(maxlen=history)
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.evaluations = 0
+
+    def attach(self, optimizer):
+        optimizer.profile = PhaseTimer()
+        return self
+
+    @property
+    def latest(self):
+        return self.records[-1] if self.records else None
+
+    def __call__(self, optimizer):
+        phases = dict(optimizer.profile.times)
+        elapsed = sum(phases.values())
+        scores = optimizer.scores
+        record = {
+            'generation': optimizer.generation,
+            'time': elapsed,
+            'phases': phases,
+            'evaluations': len(scores),
+            'evals_per_sec': len(scores) / elapsed if elapsed else 0.0,
+            'unique': optimizer.unique_schedules(),
+            'population': len(scores),
+            'fitness_min': float(np.min(scores)),
+            'fitness_mean': float(np.mean(scores)),
+            'fitness_max': float(np.max(scores)),
+            'fitness_std': float(np.std(scores)),
+        }
+        self.records.append(record)
+        for phase, seconds in phases.items():
+            self.totals[phase] += seconds
+        self.evaluations += len(scores)
+        if self.log:
+            self.log.write('telemetry', **record)
+
+    def summary(self):
+        """Lines describing the whole run: throughput and each phase's share of the time."""
+        total = sum(self.totals.values())
+        if not total:
+            return []
+        shares = ', '.join(f"{phase} {seconds / total:.0%}" for phase, seconds in
+                           sorted(self.totals.items(), key=lambda item: -item[1]))
+        return [f"Evaluations/sec: {self.evaluations / total:,.0f}", f"Time per phase: {shares}"]
+
+    def panel_texts(self):
+        """Lines for the view describing the latest record."""
+        record = self.latest
+        if record is None:
+            return []
+        phases = record['phases']
+        return [
+            f"Evals/sec: {record['evals_per_sec']:,.0f}",
+            f"Unique: {record['unique']}/{record['population']}",
+            f"Fitness min/mean: {record['fitness_min']:.1f} / {record['fitness_mean']:.1f}",
+            f"Fitness max/std: {record['fitness_max']:.1f} / {record['fitness_std']:.1f}",
+            f"Generation: {record['time'] * 1000:.2f} ms",
+        ] + [f"  {phase}: {phases[phase] * 1000:.2f} ms" for phase in PHASES]
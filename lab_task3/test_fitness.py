@@ -0,0 +1,93 @@
+# test_fitness.py
+import random
+
+import numpy as np
+import pytest
+
+from chromosome import Chromosome
+from delta_fitness import DeltaEvaluator
+from environment import Environment
+from fitness_engine import FitnessEngine
+from genetic import fitness
+from optimizer import DeltaGeneticOptimizer
+
+# (classes, students, time slots), from tiny to crowded enough that overlaps are common
+SIZES = [(1, 1, 1), (5, 2, 3), (10, 5, 8), (40, 3, 6), (60, 20, 8)]
+
+
+@pytest.mark.parametrize('seed', range(len(SIZES)))
+def test_engine_matches_fitness(seed):
+    environment = Environment(*SIZES[seed], seed=seed)
+    engine = FitnessEngine(environment)
+    population = environment.generate_population(30, np.random.RandomState(seed))
+    expected = [fitness(Chromosome(genes), environment) for genes in population]
+    assert np.allclose(engine.evaluate(population), expected)
+
+
+@pytest.mark.parametrize('seed', range(len(SIZES)))
+def test_engine_matches_fitness_on_assignments(seed):
+    environment = Environment(*SIZES[seed], seed=seed)
+    engine = FitnessEngine(environment)
+    schedules = environment.generate_assignments(10)
+    expected = [fitness(schedule, environment) for schedule in schedules]
+    assert np.allclose(engine.evaluate(engine.encode_population(schedules)), expected)
+
+
+@pytest.mark.parametrize('max_delta_genes', [0, 3, None, 1000])
+@pytest.mark.parametrize('seed', range(len(SIZES)))
+def test_delta_matches_full_scoring(seed, max_delta_genes):
+    environment = Environment(*SIZES[seed], seed=seed)
+    engine = FitnessEngine(environment)
+    delta = DeltaEvaluator(engine, max_delta_genes=max_delta_genes, max_changes=4)
+    rng = random.Random(seed)
+    population = delta.batch(environment.generate_population(10, np.random.RandomState(seed)))
+    for _ in range(5):
+        delta.prepare(population)
+        parents = [(individual, individual.genes.copy()) for individual in population]
+        children = []
+        for _ in range(len(population)):
+            parent1, parent2 = rng.choices(population, k=2)
+            point = rng.randint(1, environment.num_classes - 1) if environment.num_classes > 1 else 1
+            child = delta.crossover(parent1, parent2, point)
+            for _ in range(rng.randint(0, 3)):
+                delta.mutate(child, rng.randrange(environment.num_classes),
+                             rng.randrange(environment.num_time_slots), rng.randrange(environment.num_students))
+            children.append(child)
+        delta.flush()
+
+        genes = np.stack([child.genes for child in children])
+        assert np.allclose([child.score for child in children], engine.evaluate(genes))
+        for individual, original in parents:
+            # Children never write to their parents, counts they share included
+            assert np.array_equal(individual.genes, original)
+            assert np.array_equal(individual.counts, delta.full(original).counts)
+        for child in children:
+            if child.root is not None:
+                assert np.array_equal(child.counts, delta.full(child.genes).counts)
+        population = children
+
+
+@pytest.mark.parametrize('seed', range(len(SIZES)))
+def test_default_delta_updates_close_children_in_crossover(seed):
+    environment = Environment(*SIZES[seed], seed=seed)
+    delta = DeltaEvaluator(FitnessEngine(environment), verify=True)
+    assert delta.max_delta_genes >= 1
+    rng = random.Random(seed)
+    parent1 = delta.full(environment.generate_population(1, np.random.RandomState(seed))[0])
+    parent2 = parent1.copy()
+    for _ in range(delta.max_delta_genes):
+        delta.mutate(parent2, rng.randrange(environment.num_classes),
+                     rng.randrange(environment.num_time_slots), rng.randrange(environment.num_students))
+    for point in range(1, max(2, environment.num_classes)):
+        child = delta.crossover(parent1, parent2, point)
+        assert not delta.pending  # Scored by the delta path, not queued for flush()
+        assert np.isclose(child.score, delta.engine.evaluate(child.genes[None])[0])
+
+
+def test_delta_optimizer_verifies_every_child():
+    environment = Environment(30, 4, 6, seed=3)
+    optimizer = DeltaGeneticOptimizer(environment, 20, 10, verify=True, rng=random.Random(3),
+                                      random_state=np.random.RandomState(3))
+    optimizer.run(20)
+    assert optimizer.delta.checks > 0
+    assert np.allclose(optimizer.scores, optimizer.engine.evaluate(optimizer.population_genes()))
@@ -0,0 +1,36 @@
+# test_solver.py
+import itertools
+
+import numpy as np
+import pytest
+
+from environment import Environment
+from fitness_engine import FitnessEngine
+from solver import anneal, greedy
+
+
+def best_score(environment):
+    """Fitness of the best schedule, by trying every one."""
+    cells = list(itertools.product(range(environment.num_time_slots), range(environment.num_students)))
+    population = np.array(list(itertools.product(cells, repeat=environment.num_classes)))
+    return FitnessEngine(environment).evaluate(population).max()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_greedy_is_exact_for_one_hour_classes(seed):
+    environment = Environment(4, 2, 3, seed=seed)
+    environment.class_duration[:] = 1
+    schedule = greedy(environment)
+    assert np.isclose(FitnessEngine(environment).evaluate(schedule.genes[None])[0], best_score(environment))
+
+
+def test_greedy_is_a_heuristic_for_longer_classes():
+    environment = Environment(2, 1, 3, seed=0)
+    environment.class_priority = np.array([5, 5])
+    environment.class_duration = np.array([2, 1])
+    environment.availability = np.array([[True, True, False]])
+    environment.preference = np.array([[2.0, 1.9, 0.0]], dtype=np.float32)
+    engine = FitnessEngine(environment)
+    assert np.isclose(engine.evaluate(greedy(environment).genes[None])[0], 110.0)
+    assert np.isclose(best_score(environment), 139.0)
+    assert np.isclose(engine.evaluate(anneal(environment, 0.05, seed=0).genes[None])[0], 139.0)
@@ -0,0 +1,47 @@
+# view.py
+import pygame
+
+
+class SchedulerView:
+    """Pygame observer that draws the optimizer's current best schedule.
+
+    With a Telemetry attached to the optimizer, its latest record is listed
+    under the fitness.
+    """
+
+    def __init__(self, delay=0, telemetry=None):
+        pygame.init()
+        self.screen = pygame.display.set_mode((1200, 800))
+        pygame.display.set_caption("Class Schedule Optimization")
+        self.font = pygame.font.Font(None, 24)
+        self.delay = delay
+        self.telemetry = telemetry
+
+    def __call__(self, optimizer):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        if optimizer.current_best is None:
+            return True  # Nothing evolved yet
+
+        # Update display
+        optimizer.environment.draw_grid(self.screen, self.font, optimizer.current_best)
+
+        gen_text = self.font.render(f"Generation: {optimizer.generation}", True, (0, 0, 0))
+        fit_text = self.font.render(f"Best Fitness (Current): {optimizer.current_fitness:.2f}", True, (0, 0, 0))
+        max_fit_text = self.font.render(f"Max Fitness Achieved: {optimizer.max_fitness_achieved:.2f}", True, (0, 0, 0))
+
+        self.screen.blit(gen_text, (900, 50))
+        self.screen.blit(fit_text, (900, 80))
+        self.screen.blit(max_fit_text, (900, 110))
+        if self.telemetry:
+            for i, text in enumerate(self.telemetry.panel_texts()):
+                self.screen.blit(self.font.render(text, True, (0, 0, 0)), (900, 150 + i * 25))
+
+        pygame.display.flip()
+        if self.delay:
+            pygame.time.delay(self.delay)  # Pause after each frame when used as a plain observer
+        return True
+
+    def close(self):
+        pygame.quit()